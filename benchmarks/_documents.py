@@ -0,0 +1,20 @@
+"""Documents used by the benchmarks"""
+import _harness  # noqa: F401  Makes the epos package importable
+
+from epos.constants import Align, BarcodeType, Font
+from epos.document import EposDocument
+from epos.elements import Barcode, Cut, Feed, Image, Text
+
+
+def build_receipt(lines: int = 200, image: bool = False) -> EposDocument:
+    doc = EposDocument()
+    if image:
+        doc.add_body(Image(576, 120, 'A' * (576 * 120 // 6), align=Align.CENTER))
+    doc.add_body(Text('My Shop & Co\n', align=Align.CENTER, double_width=True, double_height=True))
+    for i in range(lines):
+        doc.add_body(Text(f'Item {i:<30}{i * 1.5:>10.2f}\n', font=Font.A, bold=i % 10 == 0))
+        if i % 20 == 0:
+            doc.add_body(Feed(1))
+    doc.add_body(Barcode(BarcodeType.CODE39, 'ORDER-1234', width=2, height=60))
+    doc.add_body(Cut())
+    return doc
@@ -0,0 +1,75 @@
+"""Small timing and memory harness shared by the benchmarks"""
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Iterable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_sec: float
+    us_per_op: float
+    peak_bytes: int
+    allocated_blocks: int
+
+
+def measure(name: str, func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> Result:
+    """
+    Time func and measure its memory use.
+
+    The time is the best of repeat runs of at least min_time seconds.
+    peak_bytes is the peak traced memory during one call,
+    allocated_blocks the number of memory blocks still allocated after it (what the result keeps alive).
+    """
+    func()  # warm up caches
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del result
+
+    return Result(name, 1 / seconds, seconds * 1e6, peak - start, blocks)
+
+
+def run(cases: Iterable[tuple[str, Callable[[], object]]]) -> list[Result]:
+    results = []
+    for name, func in cases:
+        result = measure(name, func)
+        results.append(result)
+        report(result)
+    return results
+
+
+def report(result: Result) -> None:
+    print(f'{result.name:<42} {result.ops_per_sec:>12,.1f} ops/s {result.us_per_op:>12,.1f} us/op '
+          f'{result.peak_bytes / 1024:>10,.1f} KiB peak {result.allocated_blocks:>8} blocks')
+
+
+def save(results: list[Result], path: str) -> None:
+    """Write the results to a JSON file, to compare releases"""
+    data = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [asdict(result) for result in results],
+    }
+    Path(path).write_text(json.dumps(data, indent=2))
@@ -0,0 +1,20 @@
+"""
+Measure the time and memory needed to build documents.
+
+Usage: python benchmarks/bench_elements.py
+"""
+from _documents import build_receipt
+from _harness import run
+
+from epos.constants import Font
+from epos.elements import Text
+
+
+def cases():
+    for lines in (10, 200):
+        yield f'build receipt, {lines} lines', lambda lines=lines: build_receipt(lines)
+    yield 'build Text', lambda: Text('Item\n', font=Font.A, bold=True, width=2)
+
+
+if __name__ == '__main__':
+    run(cases())
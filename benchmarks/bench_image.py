@@ -0,0 +1,45 @@
+"""
+Measure image element payload handling and, when numpy is installed, image conversion.
+
+Usage: python benchmarks/bench_image.py
+"""
+import base64
+
+from _harness import run
+
+from epos.constants import Align
+from epos.document import EposDocument
+from epos.elements import Image
+
+PAYLOAD = base64.b64encode(bytes(range(256)) * (576 * 200 // 8 // 256)).decode('ascii')
+
+
+def image_document() -> EposDocument:
+    doc = EposDocument()
+    doc.add_body(Image(576, 200, PAYLOAD, align=Align.CENTER))
+    return doc
+
+
+def cases():
+    doc = image_document()
+    yield 'Image 576x200, build', lambda: Image(576, 200, PAYLOAD)
+    yield 'Image 576x200, body_to_str', doc.body_to_str
+
+    try:
+        import numpy as np
+    except ImportError:
+        print('numpy is not installed, skipping image conversion')
+        return
+
+    from epos.raster import Dither, RasterCache, to_image
+
+    gradient = np.tile(np.linspace(0, 255, 576, dtype=np.uint8), (200, 1))
+    for dither in Dither:
+        yield f'to_image 576x200, {dither.value}', lambda dither=dither: to_image(gradient, dither=dither)
+
+    cache = RasterCache()
+    yield 'to_image 576x200, cached', lambda: to_image(gradient, cache=cache)
+
+
+if __name__ == '__main__':
+    run(cases())
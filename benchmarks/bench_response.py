@@ -0,0 +1,25 @@
+"""
+Measure parsing of the printer replies.
+
+Usage: python benchmarks/bench_response.py
+"""
+from _harness import run
+
+from epos.printer import _parse_response
+
+REPLY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+    '<response success="true" code="" status="251658262" battery="0" '
+    'xmlns="http://www.epson-pos.com/schemas/2011/03/epos-print"></response>'
+    '</s:Body></s:Envelope>'
+)
+
+
+def cases():
+    yield 'parse response', lambda: _parse_response(REPLY)
+    yield 'parse response, status_msg', lambda: _parse_response(REPLY).status_msg()
+
+
+if __name__ == '__main__':
+    run(cases())
@@ -0,0 +1,36 @@
+"""
+Measure EposDocument.body_to_str, compared to serializing through ElementTree.
+
+Usage: python benchmarks/bench_serialize.py
+"""
+import xml.etree.ElementTree as ET
+
+from _documents import build_receipt
+from _harness import run
+
+from epos.document import EposDocument
+
+
+def elementtree_body_to_str(doc: EposDocument) -> str:
+    return ET.tostring(doc.body_to_xml(), encoding='unicode').replace(' />', '/>')
+
+
+def cases():
+    for lines in (10, 100, 1000):
+        doc = build_receipt(lines, image=True)
+        assert doc.body_to_str() == elementtree_body_to_str(doc)
+        yield f'body_to_str, {lines} lines', doc.body_to_str
+        yield f'ElementTree, {lines} lines', lambda doc=doc: elementtree_body_to_str(doc)
+
+    frozen = build_receipt(100, image=True).to_fragment()
+    doc = EposDocument()
+    doc.add_body(frozen)
+    yield 'body_to_str, 100 lines frozen', doc.body_to_str
+
+    snapshot = build_receipt(100, image=True).freeze()
+    yield 'freeze, 100 lines', build_receipt(100, image=True).freeze
+    yield 'body_to_str, 100 lines snapshot', snapshot.body_to_str
+
+
+if __name__ == '__main__':
+    run(cases())
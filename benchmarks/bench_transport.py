@@ -0,0 +1,38 @@
+"""
+Measure printing end to end against the local ePOS-Print emulator.
+
+Usage: python benchmarks/bench_transport.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from _documents import build_receipt
+from _harness import run
+
+from epos.elements import Text
+from epos.emulator import Emulator
+from epos.instrumentation import MetricsRecorder
+from epos.printer import Printer
+
+
+def cases():
+    # The cases run while the generator is suspended, everything is stopped once the last one finished
+    with (
+        Emulator() as emulator,
+        Printer(emulator.address) as printer,
+        Printer(emulator.address, instrumentation=MetricsRecorder()) as instrumented,
+        Printer(emulator.address, pool_size=4) as pooled,
+        ThreadPoolExecutor(4) as pool,
+    ):
+        doc = build_receipt(50)
+        yield 'print_empty', printer.print_empty
+        yield 'print_empty, instrumented', instrumented.print_empty
+        yield 'print, 50 lines', lambda: printer.print(doc)
+        docs = [build_receipt(5) for _ in range(20)]
+        yield 'print_batch, 20 documents', lambda: printer.print_batch(docs)
+        yield 'print_stream, 1000 lines', lambda: printer.print_stream(Text(f'Line {i}\n') for i in range(1000))
+
+        # The emulator prints one job at a time, this shows the overhead of waiting for it
+        yield 'print_empty, 4 threads x 10', lambda: list(pool.map(lambda _: pooled.print_empty(), range(40)))
+
+if __name__ == '__main__':
+    run(cases())
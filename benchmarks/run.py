@@ -0,0 +1,31 @@
+"""
+Run all benchmarks.
+
+Usage: python benchmarks/run.py [--json results.json]
+"""
+import argparse
+
+import bench_elements
+import bench_image
+import bench_response
+import bench_serialize
+import bench_transport
+from _harness import run, save
+
+SUITES = (bench_elements, bench_serialize, bench_image, bench_response, bench_transport)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--json', help='Write the results to this file')
+    args = parser.parse_args()
+
+    results = []
+    for suite in SUITES:
+        results += run(suite.cases())
+    if args.json:
+        save(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
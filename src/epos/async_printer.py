@@ -0,0 +1,160 @@
+import asyncio
+from typing import Iterable
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .document import EposDocument
+from .elements import BaseElement, Response
+from .printer import (
+    DEFAULT_BATCH_BYTES, DEFAULT_STREAM_BYTES, DEFAULT_STREAM_ELEMENTS, _HEADERS, PrintJob, _batch_job, _parse_response,
+    _print_job, _soap_payload, _stream_job,
+)
+
+
+class AsyncPrinter:
+    """
+    asyncio version of Printer.
+
+    Requires the optional aiohttp dependency: pip install ePos-Print-XML[async]
+    """
+    def __init__(
+            self,
+            ip: str,
+            request_timeout: int = 3,
+            use_https: bool = False,
+            devid: str = 'local_printer',
+            job_timeout: int = 5000,
+            url: str = '/cgi-bin/epos/service.cgi',
+            max_concurrency: int = 1,
+            session: 'aiohttp.ClientSession' = None,
+            max_payload: int = None,
+    ):
+        """
+        :param max_concurrency: Maximum number of requests in flight to this printer at once
+        :param session: Shared aiohttp session, useful when driving many printers.
+            When omitted the printer creates its own session on first use.
+        :param max_payload: Maximum size in bytes of a request, see Printer
+        """
+        if aiohttp is None:
+            raise ImportError('AsyncPrinter requires aiohttp, install it with: pip install ePos-Print-XML[async]')
+
+        self.ip = ip
+        self.request_timeout = request_timeout
+        self.use_https = use_https
+        self.devid = devid
+        self.job_timeout = job_timeout
+        self.url = url
+        self.max_payload = max_payload
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if it is owned by this printer"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def printer_ready(self) -> bool:
+        """
+        Send empty page to check the status
+
+        Returns true if online, false if offline.
+
+        :return Boolean
+        """
+        response = await self.print_empty()
+        return response.success
+
+    async def print_empty(self) -> Response:
+        """
+        Send an empty document to the printer.
+        Used to gather status information
+
+        :return: Response
+        """
+        doc = EposDocument()
+        response = await self.print(doc, autocut=False)
+        return response
+
+    async def print(self, doc: EposDocument, autocut: bool = True) -> Response:
+        """
+        Print a document, the cut is only added to the request and the document is not changed
+
+        :return: Response
+        """
+        return await self._run(_print_job(doc, autocut, self.max_payload))
+
+    async def print_batch(
+            self,
+            docs: Iterable[EposDocument],
+            autocut: bool = True,
+            max_bytes: int = DEFAULT_BATCH_BYTES,
+    ) -> list[Response]:
+        """
+        Print multiple documents in as few requests as possible, see Printer.print_batch()
+
+        :return: List with a Response per document
+        """
+        return await self._run(_batch_job(docs, autocut, max_bytes, self.max_payload))
+
+    async def print_stream(
+            self,
+            elements: Iterable[BaseElement],
+            autocut: bool = True,
+            max_bytes: int = DEFAULT_STREAM_BYTES,
+            max_elements: int = DEFAULT_STREAM_ELEMENTS,
+    ) -> Response:
+        """
+        Print a long sequence of elements in jobs of limited size, see Printer.print_stream()
+
+        :return: Response of the last job, or of the first job that failed
+        """
+        return await self._run(_stream_job(elements, autocut, max_bytes, max_elements, self.max_payload))
+
+    async def print_xml(self, data: str) -> Response:
+        """
+        Send an already serialized epos-print body to the printer,
+        e.g. the output of EposDocument.body_to_str() or Template.render()
+
+        :return: Response
+        """
+        r = await self._send_printjob(data)
+        return _parse_response(r)
+
+    async def _run(self, job: PrintJob):
+        """Send the bodies of a print job to the printer, see epos.printer.PrintJob"""
+        try:
+            data = next(job)
+            while True:
+                data = job.send(await self.print_xml(data))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _send_printjob(self, data: str) -> str:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        prefix = 'https://' if self.use_https else 'http://'
+        url = prefix + self.ip + self.url
+        params = {'devid': self.devid, 'timeout': self.job_timeout}
+
+        async with self._semaphore:
+            async with self._session.post(
+                    url,
+                    data=_soap_payload(data),
+                    headers=_HEADERS,
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            ) as response:
+                return await response.text()
@@ -1,10 +1,8 @@
-from .constants import Align, Font, Color
+from .constants import Align, Font, Color, Dir
 
 
 class AlignAtt:
-    def __init__(self, align: Align, **kwargs):
-        super().__init__(**kwargs)
-        self.align = align
+    __slots__ = ()
 
     @property
     def align(self) -> Align:
@@ -12,6 +10,7 @@ class AlignAtt:
 
     @align.setter
     def align(self, align: Align):
+        self._changed()
         try:
             align = Align(align)
         except ValueError:
@@ -23,11 +22,8 @@ class AlignAtt:
 
 
 class WidthAtt:
-    def __init__(self, width: int, min_width: int, max_width: int, **kwargs):
-        super().__init__(**kwargs)
-        self._min_width = min_width
-        self._max_width = max_width
-        self.width = width
+    """The element class sets the bounds in _min_width and _max_width"""
+    __slots__ = ()
 
     @property
     def width(self) -> int:
@@ -35,6 +31,7 @@ class WidthAtt:
 
     @width.setter
     def width(self, width: int):
+        self._changed()
         try:
             width = int(width)
         except TypeError:
@@ -47,11 +44,8 @@ class WidthAtt:
 
 
 class HeightAtt:
-    def __init__(self, height: int, min_height: int, max_height: int, **kwargs):
-        super().__init__(**kwargs)
-        self._min_height = min_height
-        self._max_height = max_height
-        self.height = height
+    """The element class sets the bounds in _min_height and _max_height"""
+    __slots__ = ()
 
     @property
     def height(self) -> int:
@@ -59,6 +53,7 @@ class HeightAtt:
 
     @height.setter
     def height(self, height: int):
+        self._changed()
         try:
             height = int(height)
         except TypeError:
@@ -70,10 +65,72 @@ class HeightAtt:
         self._height = height
 
 
+class XAtt:
+    """The element class sets the bounds in _min_x and _max_x"""
+    __slots__ = ()
+
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @x.setter
+    def x(self, x: int):
+        self._changed()
+        try:
+            x = int(x)
+        except TypeError:
+            pass
+
+        if x is not None and (x < self._min_x or x > self._max_x):
+            raise ValueError(
+                f'"x" must be between {self._min_x} and {self._max_x} inclusive')
+        self._x = x
+
+
+class YAtt:
+    """The element class sets the bounds in _min_y and _max_y"""
+    __slots__ = ()
+
+    @property
+    def y(self) -> int:
+        return self._y
+
+    @y.setter
+    def y(self, y: int):
+        self._changed()
+        try:
+            y = int(y)
+        except TypeError:
+            pass
+
+        if y is not None and (y < self._min_y or y > self._max_y):
+            raise ValueError(
+                f'"y" must be between {self._min_y} and {self._max_y} inclusive')
+        self._y = y
+
+
+class DirAtt:
+    __slots__ = ()
+
+    @property
+    def dir(self) -> Dir:
+        return self._dir
+
+    @dir.setter
+    def dir(self, dir: Dir):
+        self._changed()
+        try:
+            dir = Dir(dir)
+        except ValueError:
+            pass
+
+        if dir is not None and not isinstance(dir, Dir):
+            raise ValueError('Unknown direction')
+        self._dir = dir
+
+
 class FontAtt:
-    def __init__(self, font: Font, **kwargs):
-        super().__init__(**kwargs)
-        self.font = font
+    __slots__ = ()
 
     @property
     def font(self) -> Font:
@@ -81,6 +138,7 @@ class FontAtt:
 
     @font.setter
     def font(self, font: Font):
+        self._changed()
         try:
             font = Font(font)
         except ValueError:
@@ -92,11 +150,10 @@ class FontAtt:
 
 
 class LineSpcAtt:
-    def __init__(self, linespc, min_linespc=0, max_linespc=255, **kwargs):
-        super().__init__(**kwargs)
-        self._min_linespc = min_linespc
-        self._max_linespc = max_linespc
-        self.linespc = linespc
+    __slots__ = ()
+
+    _min_linespc = 0
+    _max_linespc = 255
 
     @property
     def linespc(self) -> int:
@@ -104,6 +161,7 @@ class LineSpcAtt:
 
     @linespc.setter
     def linespc(self, linespc: int):
+        self._changed()
         try:
             linespc = int(linespc)
         except TypeError:
@@ -117,9 +175,7 @@ class LineSpcAtt:
 
 
 class RotateAtt:
-    def __init__(self, rotate, **kwargs):
-        super().__init__(**kwargs)
-        self._rotate = rotate
+    __slots__ = ()
 
     @property
     def rotate(self) -> bool:
@@ -127,6 +183,7 @@ class RotateAtt:
 
     @rotate.setter
     def rotate(self, rotate: bool):
+        self._changed()
         try:
             rotate = bool(rotate)
         except TypeError:
@@ -136,9 +193,7 @@ class RotateAtt:
 
 
 class ColorAtt:
-    def __init__(self, color, **kwargs):
-        super().__init__(**kwargs)
-        self.color = color
+    __slots__ = ()
 
     @property
     def color(self) -> Color:
@@ -146,6 +201,7 @@ class ColorAtt:
 
     @color.setter
     def color(self, color: Color):
+        self._changed()
         try:
             color = Color(color)
         except TypeError:
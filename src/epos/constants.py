@@ -14,6 +14,7 @@ class Align(Enum):
 
 class Mode(Enum):
     MONO = 'mono'
+    GRAY16 = 'gray16'
 
 
 class Font(Enum):
@@ -52,6 +53,13 @@ class CutType(Enum):
     FEED = 'feed'
 
 
+class Dir(Enum):
+    LEFT_TO_RIGHT = 'left_to_right'
+    BOTTOM_TO_TOP = 'bottom_to_top'
+    RIGHT_TO_LEFT = 'right_to_left'
+    TOP_TO_BOTTOM = 'top_to_bottom'
+
+
 class Lang(Enum):
     EN = 'en'
     DE = 'de'
@@ -1,8 +1,10 @@
+import copy
 from dataclasses import dataclass, field
-from typing import Type, Generic, TypeVar
+from typing import Type, Generic, TypeVar, Iterable
 import xml.etree.ElementTree as ET
 
-from .elements import BaseElement
+from .constants import Dir
+from .elements import BaseElement, EPOS_PRINT_NS, Area, Direction, Page
 
 B = TypeVar('B', bound='BaseElement')
 
@@ -18,6 +20,41 @@ class EposDocument:
     def add_body(self, element: Generic[B]) -> None:
         self.body.append(element)
 
+    def add_page(
+            self,
+            elements: Iterable[BaseElement] = (),
+            area: tuple[int, int, int, int] = None,
+            direction: Dir = None,
+    ) -> Page:
+        """
+        Add a page mode section to the body.
+
+        :param elements: Elements to print in the page
+        :param area: Print area as (x, y, width, height) in dots
+        :param direction: Print direction
+        :return: The Page, more elements can be added with Page.add()
+        """
+        page = Page()
+        if area is not None:
+            page.add(Area(*area))
+        if direction is not None:
+            page.add(Direction(direction))
+        for element in elements:
+            page.add(element)
+        self.add_body(page)
+        return page
+
+    def to_fragment(self) -> 'Fragment':
+        """Freeze the body of this document into a Fragment that can be reused in other documents"""
+        return Fragment(self.body)
+
+    def freeze(self) -> 'FrozenDocument':
+        """
+        Immutable snapshot of this document, see FrozenDocument.
+        The elements are copied, later changes to this document do not affect the snapshot.
+        """
+        return FrozenDocument(_frozen_copies(self.parameters), _frozen_copies(self.body))
+
     def parameters_to_xml(self) -> ET.Element:
         return _to_xml('parameter', self.parameters)
 
@@ -28,18 +65,214 @@ class EposDocument:
         return ET.tostring(self.parameters_to_xml(), encoding='unicode', short_empty_elements=False)
 
     def body_to_str(self, url_encode_newlines=False) -> str:
-        s = ET.tostring(self.body_to_xml(), encoding='unicode')
-        s = s.replace(' />', '/>')
+        s = _to_str('epos-print', self.body)
         if url_encode_newlines:
             s = s.replace('\n', '&#10;')
         return s
 
+    def _content(self) -> str:
+        """Serialized body without the epos-print tag"""
+        return _content_str(self.body)
+
+    def _body_str(self, extra: str) -> str:
+        """Serialized body with extra content at the end"""
+        return _to_str('epos-print', self.body, extra)
+
+
+class FrozenDocument:
+    """
+    Immutable, hashable snapshot of an EposDocument, created with EposDocument.freeze().
+
+    The body is a tuple of frozen copies of the elements and is serialized once, when the snapshot is made.
+    A snapshot can be printed and serialized from many threads at once, and is printed like an EposDocument.
+    Setting a property of one of its elements raises AttributeError, copies of the elements can be changed.
+
+    Deriving a new snapshot shares the elements and the serialized body of this one:
+    receipt = header.extend(items) or receipt = header + items.freeze()
+    """
+    __slots__ = ('parameters', 'body', '_content_cache', '_hash')
+
+    def __init__(self, parameters: tuple = (), body: tuple[BaseElement, ...] = (), _content: str = None):
+        object.__setattr__(self, 'parameters', tuple(parameters))
+        object.__setattr__(self, 'body', tuple(body))
+        object.__setattr__(self, '_content_cache', _content_str(self.body) if _content is None else _content)
+        object.__setattr__(self, '_hash', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __reduce__(self):
+        # Setting the slots of a copy directly is blocked
+        return _restore_frozen, (self.parameters, self.body, self._content_cache)
+
+    def __repr__(self):
+        return f'FROZEN DOCUMENT: {list(self.body)}'
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._content_cache == other._content_cache and self.parameters_to_str() == other.parameters_to_str()
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash((self._content_cache, self.parameters_to_str())))
+        return self._hash
+
+    def __add__(self, other: 'FrozenDocument') -> 'FrozenDocument':
+        if not isinstance(other, FrozenDocument):
+            return NotImplemented
+        return FrozenDocument(
+            self.parameters + other.parameters,
+            self.body + other.body,
+            self._content_cache + other._content_cache,
+        )
+
+    def extend(self, elements: Iterable[BaseElement]) -> 'FrozenDocument':
+        """
+        New snapshot with elements added to the body.
+        Only the new elements are copied and serialized.
+        """
+        elements = _frozen_copies(elements)
+        return FrozenDocument(self.parameters, self.body + elements, self._content_cache + _content_str(elements))
+
+    def thaw(self) -> EposDocument:
+        """Editable EposDocument with copies of the elements"""
+        return EposDocument(list(copy.deepcopy(self.parameters)), list(copy.deepcopy(self.body)))
+
+    def to_fragment(self) -> 'Fragment':
+        return Fragment(self.body)
+
+    def parameters_to_xml(self) -> ET.Element:
+        return _to_xml('parameter', self.parameters)
+
+    def body_to_xml(self) -> ET.Element:
+        return _to_xml('epos-print', self.body)
+
+    def parameters_to_str(self) -> str:
+        return ET.tostring(self.parameters_to_xml(), encoding='unicode', short_empty_elements=False)
+
+    def body_to_str(self, url_encode_newlines=False) -> str:
+        s = self._body_str('')
+        if url_encode_newlines:
+            s = s.replace('\n', '&#10;')
+        return s
+
+    def _content(self) -> str:
+        return self._content_cache
+
+    def _body_str(self, extra: str) -> str:
+        return _join_str('epos-print', (self._content_cache, extra))
+
+
+class Fragment:
+    """
+    Fixed sequence of elements, like a header or footer that is the same on every receipt.
+    All elements are frozen and the XML of the whole fragment is computed only once.
+    It is recomputed when one of the elements changes.
+
+    A fragment is added to the body of an EposDocument like any other element.
+    """
+    def __init__(self, elements: Iterable[BaseElement]):
+        self.elements = tuple(element.freeze() for element in elements)
+        self._xml_cache = None
+
+    def __repr__(self):
+        return f'FRAGMENT: {list(self.elements)}'
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def freeze(self) -> 'Fragment':
+        return self
+
+    def to_xml(self) -> list[ET.Element]:
+        xml = []
+        for element in self.elements:
+            if isinstance(element, Fragment):
+                xml.extend(element.to_xml())
+            else:
+                xml.append(element.to_xml())
+        return xml
+
+    def to_xml_str(self) -> str:
+        out = []
+        self._write_xml(out)
+        return ''.join(out)
+
+    def _write_xml(self, out: list[str]) -> None:
+        if not self._is_cached():
+            cache = []
+            for element in self.elements:
+                element._write_xml(cache)
+            self._xml_cache = ''.join(cache)
+        out.append(self._xml_cache)
+
+    def _is_cached(self) -> bool:
+        return self._xml_cache is not None and all(element._is_cached() for element in self.elements)
+
+    def _lock(self) -> 'Fragment':
+        for element in self.elements:
+            element._lock()
+        return self
+
+
+def _restore_frozen(parameters: tuple, body: tuple, content: str) -> FrozenDocument:
+    """Rebuild a copied or unpickled FrozenDocument, its copied elements are unlocked"""
+    return FrozenDocument(
+        tuple(element._lock() for element in parameters),
+        tuple(element._lock() for element in body),
+        content,
+    )
+
+
+def _frozen_copies(elements: Iterable[BaseElement]) -> tuple[BaseElement, ...]:
+    return tuple(copy.deepcopy(element).freeze()._lock() for element in elements)
+
+
+def _to_str(base_tag: str, element_list: list[Type[B], ...], extra: str = '') -> str:
+    """
+    Serialize the elements straight into one string buffer.
+    Gives the same output as ElementTree would for _to_xml(), with '/>' for empty elements.
+
+    :param extra: Serialized content to add after the elements, e.g. a cut
+    """
+    if not element_list and not extra:
+        return f'<{base_tag} xmlns="{EPOS_PRINT_NS}"/>'
+
+    out = [f'<{base_tag} xmlns="{EPOS_PRINT_NS}">']
+    for element in element_list:
+        element._write_xml(out)
+    out.append(f'{extra}</{base_tag}>')
+    return ''.join(out)
+
+
+def _content_str(element_list: Iterable[B]) -> str:
+    """Serialize the elements without the surrounding base tag"""
+    out = []
+    for element in element_list:
+        element._write_xml(out)
+    return ''.join(out)
+
+
+def _join_str(base_tag: str, contents: Iterable[str]) -> str:
+    """Put serialized content from _content_str() in one base tag, as _to_str() would"""
+    content = ''.join(contents)
+    if not content:
+        return f'<{base_tag} xmlns="{EPOS_PRINT_NS}"/>'
+    return f'<{base_tag} xmlns="{EPOS_PRINT_NS}">{content}</{base_tag}>'
+
 
 def _to_xml(base_tag: str, element_list: list[Type[B], ...]) -> ET.Element:
     root = ET.Element(
         base_tag,
-        xmlns='http://www.epson-pos.com/schemas/2011/03/epos-print',
+        xmlns=EPOS_PRINT_NS,
     )
     for element in element_list:
-        root.append(element.to_xml())
+        if isinstance(element, Fragment):
+            root.extend(element.to_xml())
+        else:
+            root.append(element.to_xml())
     return root
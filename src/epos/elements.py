@@ -1,43 +1,186 @@
 import xml.etree.ElementTree as ET
-from typing import List
-from dataclasses import dataclass
+from enum import Enum
+from types import MappingProxyType
+from typing import Iterable, List
 
 from . import status
-from .attributes import AlignAtt, ColorAtt, WidthAtt, HeightAtt, FontAtt, RotateAtt, LineSpcAtt
-from .constants import Color, Align, Mode, BarcodeType, HRI, Font, CutType, Lang
+from .attributes import AlignAtt, ColorAtt, WidthAtt, HeightAtt, FontAtt, RotateAtt, LineSpcAtt, XAtt, YAtt, DirAtt
+from .constants import Color, Align, Mode, BarcodeType, HRI, Font, CutType, Lang, Dir
+
+EPOS_PRINT_NS = 'http://www.epson-pos.com/schemas/2011/03/epos-print'
+
+
+def _escape_cdata(text: str) -> str:
+    """Escape text the same way as ElementTree"""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _escape_attrib(text: str) -> str:
+    """Escape an attribute value the same way as ElementTree"""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if '\r' in text:
+        text = text.replace('\r', '&#13;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    if '\t' in text:
+        text = text.replace('\t', '&#09;')
+    return text
+
+
+def _attr_value(value) -> str | None:
+    if isinstance(value, Enum):
+        value = value.value
+        if value is None:
+            return None
+    return str(value).lower()
+
+
+def _compile_attributes(name: str, attributes: tuple) -> callable:
+    """
+    Generate the function that writes the XML attributes of an element class.
+
+    Names and enum values are escaped and formatted up front,
+    only attributes that are set are written.
+    """
+    lines = ['def _write_attrs(self, out):']
+    namespace = {'_escape_attrib': _escape_attrib}
+
+    for i, (attr_name, slot, kind, *skip) in enumerate(attributes):
+        lines.append(f'    v = self.{slot}')
+        if issubclass(kind, Enum):
+            table = {}
+            for member in kind:
+                value = _attr_value(member)
+                table[member] = '' if value is None or member in skip else f' {attr_name}="{_escape_attrib(value)}"'
+            namespace[f'table_{i}'] = table
+            lines += [
+                '    if v is not None:',
+                f'        s = table_{i}[v]',
+                '        if s:',
+                '            out.append(s)',
+            ]
+        elif kind is bool:
+            lines += [
+                '    if v is True:',
+                f"        out.append(' {attr_name}=\"true\"')",
+                '    elif v is False:',
+                f"        out.append(' {attr_name}=\"false\"')",
+                '    elif v is not None:',
+                f"        out.append(' {attr_name}=\"' + _escape_attrib(str(v).lower()) + '\"')",
+            ]
+        elif kind is int:
+            lines += [
+                '    if v is not None:',
+                f"        out.append(' {attr_name}=\"' + str(v) + '\"')",
+            ]
+        else:
+            raise TypeError(f'{name}: unsupported attribute type {kind!r} for {attr_name!r}')
+
+    if not attributes:
+        lines.append('    pass')
+    exec('\n'.join(lines), namespace)
+    return namespace['_write_attrs']
 
 
-@dataclass
 class BaseElement:
     """
     Base class for all ePOS-Print XML elements
+
+    Element classes list their XML attributes in _attributes, in output order, as tuples of
+    (XML name, instance attribute, type[, value that is left out]).
+    The type is an Enum, bool or int. A specialized _write_attrs() is generated once per class from it.
     """
-    tag: str
-    text: str
+    __slots__ = ('tag', '_text', '_frozen', '_locked', '_xml_cache')
+
+    _attributes = ()
+
+    tail = ''
+    namespaces = MappingProxyType({
+        's': 'http://schemas.xmlsoap.org/soap/envelope/',
+        'epos-print': EPOS_PRINT_NS,
+    })
 
-    def __init__(self, tag, text='', **kwargs):
-        super().__init__(**kwargs)
+    def __init__(self, tag, text=''):
+        self._locked = False
+        self._xml_cache = None
+        self._frozen = False
         self.tag = tag
-        self.attr = {}
         self.text = text
-        self.tail = ''
 
-        self.namespaces = {
-            's': 'http://schemas.xmlsoap.org/soap/envelope/',
-            'epos-print': 'http://www.epson-pos.com/schemas/2011/03/epos-print',
-        }
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '_attributes' in cls.__dict__:
+            cls._write_attrs = _compile_attributes(cls.__name__, cls._attributes)
 
     def __repr__(self):
         return f'{self.tag.upper()}: {repr(self.text)} {self.attr}'
 
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.tag, self.text) == (other.tag, other.text)
+
+    __hash__ = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, text: str):
+        self._changed()
+        self._text = text
+
+    @property
+    def attr(self) -> dict[str, str]:
+        """The XML attributes that are set, as they are serialized"""
+        attr = {}
+        for spec in self._attributes:
+            value = getattr(self, spec[1])
+            if value is not None and value not in spec[3:]:
+                value = _attr_value(value)
+                if value is not None:
+                    attr[spec[0]] = value
+        return attr
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self):
+        """
+        Cache the serialized XML of this element.
+        The cache is cleared automatically when a property of the element is set.
+
+        :return: The element itself
+        """
+        self._frozen = True
+        return self
+
+    def unfreeze(self):
+        """Stop caching the serialized XML of this element"""
+        self._changed()
+        self._frozen = False
+        return self
+
     def to_xml(self):
         """
         Converts the object to XML
         """
-        self.attr = {}
-        self._load_attrs()
-        attr = {k: str(v).lower() for k, v in self.attr.items() if v is not None}
-        element = ET.Element(self.tag, attr)
+        element = ET.Element(self.tag, self.attr)
         element.text = self.text
         element.tail = self.tail
         return element
@@ -45,22 +188,82 @@ class BaseElement:
     def to_str(self):
         return ET.tostring(self.to_xml(), encoding='utf-8', )
 
+    def to_xml_str(self) -> str:
+        """
+        Converts the object directly to an XML string, without building an ElementTree element
+        """
+        out = []
+        self._write_xml(out)
+        return ''.join(out)
+
+    def _write_xml(self, out: list[str]) -> None:
+        """Append the XML of the object to the out buffer"""
+        if self._frozen:
+            if self._xml_cache is None:
+                cache = []
+                self._serialize(cache)
+                self._xml_cache = ''.join(cache)
+            out.append(self._xml_cache)
+        else:
+            self._serialize(out)
+
+    def _is_cached(self) -> bool:
+        return self._xml_cache is not None
+
+    def _changed(self) -> None:
+        """Called before a property changes, clears the cached XML"""
+        if self._locked:
+            raise AttributeError(f'{self.tag} element of a FrozenDocument cannot be changed')
+        self._xml_cache = None
+
+    def _lock(self):
+        """
+        Make the setters raise, for the elements of a FrozenDocument.
+        Copies of a locked element can be changed again.
+
+        :return: The element itself
+        """
+        self._locked = True
+        return self
+
+    def __reduce_ex__(self, protocol):
+        reduced = super().__reduce_ex__(protocol)
+        if self._locked:
+            func, args, (state, slots), *rest = reduced
+            reduced = (func, args, (state, dict(slots, _locked=False)), *rest)
+        return reduced
+
+    def _serialize(self, out: list[str]) -> None:
+        tag = self.tag
+        out.append('<' + tag)
+        self._write_attrs(out)
+        text = self._text
+        if text:
+            out.append('>' + _escape_cdata(text) + '</' + tag + '>')
+        else:
+            out.append('/>')
+        if self.tail:
+            out.append(_escape_cdata(self.tail))
+
+    def _write_attrs(self, out: list[str]) -> None:
+        """Replaced by a generated function for every class with _attributes"""
+
     def _add_ns(self, tag: str) -> str:
         r = f'{{{self.namespaces["a"]}}}{tag}'
         # print(r)
         return r
 
-    def _load_attrs(self):
-        """To be overwritten by element class"""
-        raise NotImplementedError
 
-
-class Response(BaseElement):
+class Response:
     """
     This is an XML document that is sent back from a printer to an application.
     Reference:
     https://reference.epson-biz.com/modules/ref_epos_print_xml_en/index.php?vid=ref_epos_print_xml_en_xmlforcontrollingprinter_response
     """
+    __slots__ = ('success', 'code', 'status', 'battery')
+
+    tag = 'response'
+
     def __init__(
             self,
             success: bool = True,
@@ -68,8 +271,6 @@ class Response(BaseElement):
             status: int = 0,
             battery: int = 0,
     ):
-        super().__init__('response')
-
         self.success = success
         self.code = code
         self.status = status
@@ -78,18 +279,71 @@ class Response(BaseElement):
     def __repr__(self):
         return f'Success: {self.success}, Code: {repr(self.code)}, Status: {self.status}, Battery: {self.battery}'
 
-    def _load_attrs(self):
-        self.attr['xmlns'] = self.namespaces['epos-print']
-        self.attr['success'] = str(self.success).lower()
-        self.attr['code'] = self.code
-        self.attr['status'] = self.status
-        self.attr['battery'] = self.battery
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.success, self.code, self.status, self.battery) == \
+            (other.success, other.code, other.status, other.battery)
+
+    @property
+    def asb(self) -> status.ASB:
+        """The status as ASB flags"""
+        return status.ASB(self.status)
+
+    def to_xml(self) -> ET.Element:
+        return ET.Element(self.tag, {
+            'xmlns': EPOS_PRINT_NS,
+            'success': str(self.success).lower(),
+            'code': self.code,
+            'status': str(self.status),
+            'battery': str(self.battery),
+        })
+
+    def to_str(self):
+        return ET.tostring(self.to_xml(), encoding='utf-8', )
 
     def status_msg(self) -> List[str]:
         return status.parse_code(self.status)
 
+    def status_info(self) -> tuple[status.StatusInfo, ...]:
+        """Status messages with their severity, category and whether they are recoverable"""
+        return status.decode(self.status)
+
+    @property
+    def severity(self) -> status.Severity:
+        return status.severity(self.status)
+
 
 class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, RotateAtt, ColorAtt):
+    __slots__ = (
+        '_font', '_width', '_height', '_align', '_linespc', '_rotate', '_color', '_lang', '_smooth',
+        '_double_width', '_double_height', '_reverse', '_underline', '_bold', '_x', '_y',
+    )
+
+    _min_width = 1
+    _max_width = 8
+    _min_height = 1
+    _max_height = 8
+
+    _attributes = (
+        ('lang', '_lang', Lang),
+        ('font', '_font', Font),
+        ('dw', '_double_width', bool),
+        ('dh', '_double_height', bool),
+        ('width', '_width', int),
+        ('height', '_height', int),
+        ('reverse', '_reverse', bool),
+        ('em', '_bold', bool),
+        ('color', '_color', Color),
+        ('x', '_x', int),
+        ('y', '_y', int),
+        ('align', '_align', Align),
+        ('rotate', '_rotate', bool),
+        ('linespc', '_linespc', int),
+        ('smooth', '_smooth', bool),
+        ('ul', '_underline', bool),
+    )
+
     def __init__(
             self,
             text: str = '',
@@ -110,18 +364,14 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
             rotate: bool = None,
             linespc: int = None
     ):
-        super().__init__(
-            tag='text',
-            text=text,
-            font=font,
-            width=width, min_width=1, max_width=8,
-            height=height, min_height=1, max_height=8,
-            align=align,
-            linespc=linespc,
-            rotate=rotate,
-            color=color
-        )
-
+        super().__init__('text', text)
+        self.font = font
+        self.width = width
+        self.height = height
+        self.align = align
+        self.linespc = linespc
+        self._rotate = rotate
+        self.color = color
         self.lang = lang
         self.smooth = smooth
         self.double_width = double_width
@@ -132,30 +382,13 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
         self.x = x
         self.y = y
 
-    def _load_attrs(self):
-        self.attr['lang'] = self.lang.value if self.lang else None
-        self.attr['font'] = self.font.value if self.font else None
-        self.attr['dw'] = self.double_width
-        self.attr['dh'] = self.double_height
-        self.attr['width'] = self.width
-        self.attr['height'] = self.height
-        self.attr['reverse'] = self.reverse
-        self.attr['em'] = self.bold
-        self.attr['color'] = self.color.value if self.color else None
-        self.attr['x'] = self.x
-        self.attr['y'] = self.y
-        self.attr['align'] = self.align.value if self.align else None
-        self.attr['rotate'] = self.rotate
-        self.attr['linespc'] = self.linespc
-        self.attr['smooth'] = self.smooth
-        self.attr['ul'] = self.underline
-
     @property
     def lang(self) -> Lang:
         return self._lang
 
     @lang.setter
     def lang(self, lang: Lang):
+        self._changed()
         try:
             lang = Lang(lang)
         except ValueError:
@@ -171,6 +404,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @smooth.setter
     def smooth(self, smooth: bool):
+        self._changed()
         if smooth == 'true':
             self._smooth = True
         elif smooth == 'false':
@@ -184,6 +418,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @double_width.setter
     def double_width(self, double_width: bool):
+        self._changed()
         if double_width == 'true':
             self._double_width = True
         elif double_width == 'false':
@@ -197,6 +432,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @dw.setter
     def dw(self, dw):
+        self._changed()
         self.double_width = dw
 
     @property
@@ -205,6 +441,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @double_height.setter
     def double_height(self, double_height: bool):
+        self._changed()
         if double_height == 'true':
             self._double_height = True
         elif double_height == 'false':
@@ -218,6 +455,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @dh.setter
     def dh(self, dh):
+        self._changed()
         self.double_height = dh
 
     @property
@@ -226,6 +464,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @reverse.setter
     def reverse(self, reverse: bool):
+        self._changed()
         if reverse == 'true':
             self._reverse = True
         elif reverse == 'false':
@@ -239,6 +478,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @underline.setter
     def underline(self, underline: bool):
+        self._changed()
         if underline == 'true':
             self._underline = True
         elif underline == 'false':
@@ -252,6 +492,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @ul.setter
     def ul(self, ul):
+        self._changed()
         self.underline = ul
 
     @property
@@ -260,6 +501,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @bold.setter
     def bold(self, bold: bool | str):
+        self._changed()
         if bold == 'true':
             self._bold = True
         elif bold == 'false':
@@ -273,6 +515,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @em.setter
     def em(self, em):
+        self._changed()
         self.bold = em
 
     @property
@@ -281,6 +524,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @x.setter
     def x(self, x: int):
+        self._changed()
         try:
             x = int(x)
         except TypeError:
@@ -296,6 +540,7 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
     @y.setter
     def y(self, y: int):
+        self._changed()
         try:
             y = int(y)
         except TypeError:
@@ -307,30 +552,32 @@ class Text(BaseElement, FontAtt, WidthAtt, HeightAtt, AlignAtt, LineSpcAtt, Rota
 
 
 class Feed(BaseElement, LineSpcAtt):
+    __slots__ = ('_linespc', '_unit', '_line')
+
+    _attributes = (
+        ('unit', '_unit', int),
+        ('line', '_line', int),
+        ('linespc', '_linespc', int),
+    )
+
     def __init__(
             self,
             line: int = None,
             unit: int = None,
             linespc: int = None
     ):
-        super().__init__(
-            tag='feed',
-            linespc=linespc
-        )
+        super().__init__('feed')
+        self.linespc = linespc
         self.unit = unit
         self.line = line
 
-    def _load_attrs(self):
-        self.attr['unit'] = self.unit
-        self.attr['line'] = self.line
-        self.attr['linespc'] = self.linespc
-
     @property
     def unit(self) -> int:
         return self._unit
 
     @unit.setter
     def unit(self, unit: int):
+        self._changed()
         try:
             unit = int(unit)
         except TypeError:
@@ -346,6 +593,7 @@ class Feed(BaseElement, LineSpcAtt):
 
     @line.setter
     def line(self, line: int):
+        self._changed()
         try:
             line = int(line)
         except TypeError:
@@ -357,6 +605,21 @@ class Feed(BaseElement, LineSpcAtt):
 
 
 class Image(BaseElement, AlignAtt, ColorAtt, WidthAtt, HeightAtt):
+    __slots__ = ('_align', '_color', '_width', '_height', '_mode')
+
+    _min_width = 0
+    _max_width = 576
+    _min_height = 0
+    _max_height = 655635
+
+    _attributes = (
+        ('width', '_width', int),
+        ('height', '_height', int),
+        ('color', '_color', Color),
+        ('align', '_align', Align),
+        ('mode', '_mode', Mode, Mode.MONO),
+    )
+
     def __init__(
             self,
             width: int = 0, height: int = 0,
@@ -365,30 +628,20 @@ class Image(BaseElement, AlignAtt, ColorAtt, WidthAtt, HeightAtt):
             align: Align = None,
             mode: Mode = Mode.MONO
     ):
-        super().__init__(
-            tag='image',
-            text=text,
-            align=align,
-            width=width, min_width=0, max_width=576,
-            height=height, min_height=0, max_height=655635,
-            color=color
-        )
+        super().__init__('image', text)
+        self.align = align
+        self.width = width
+        self.height = height
+        self.color = color
         self.mode = mode
 
-    def _load_attrs(self):
-        self.attr['width'] = self.width
-        self.attr['height'] = self.height
-        self.attr['color'] = self.color.value
-        self.attr['align'] = self.align.value if self.align else None
-        if self.mode != Mode.MONO:
-            self.attr['mode'] = self.mode.value
-
     @property
     def mode(self) -> Mode:
         return self._mode
 
     @mode.setter
     def mode(self, mode: Mode):
+        self._changed()
         try:
             mode = Mode(mode)
         except TypeError:
@@ -400,27 +653,32 @@ class Image(BaseElement, AlignAtt, ColorAtt, WidthAtt, HeightAtt):
 
 
 class Logo(BaseElement, AlignAtt):
+    __slots__ = ('_align', '_key1', '_key2')
+
+    _attributes = (
+        ('key1', '_key1', int),
+        ('key2', '_key2', int),
+        ('align', '_align', Align),
+    )
+
     def __init__(
             self,
             key1: int = 0,
             key2: int = 0,
             align: Align = None
     ):
-        super().__init__(tag='logo', align=align)
+        super().__init__('logo')
+        self.align = align
         self.key1 = key1
         self.key2 = key2
 
-    def _load_attrs(self):
-        self.attr['key1'] = str(self.key1)
-        self.attr['key2'] = str(self.key2)
-        self.attr['align'] = self.align
-
     @property
     def key1(self) -> int:
         return self._key1
 
     @key1.setter
     def key1(self, key1: int):
+        self._changed()
         try:
             key1 = int(key1)
         except TypeError:
@@ -436,6 +694,7 @@ class Logo(BaseElement, AlignAtt):
 
     @key2.setter
     def key2(self, key2: int):
+        self._changed()
         try:
             key2 = int(key2)
         except TypeError:
@@ -447,6 +706,23 @@ class Logo(BaseElement, AlignAtt):
 
 
 class Barcode(BaseElement, AlignAtt, WidthAtt, HeightAtt, FontAtt, RotateAtt):
+    __slots__ = ('_align', '_width', '_height', '_font', '_rotate', '_type', '_hri')
+
+    _min_width = 2
+    _max_width = 6
+    _min_height = 0
+    _max_height = 255
+
+    _attributes = (
+        ('type', '_type', BarcodeType),
+        ('hri', '_hri', HRI),
+        ('font', '_font', Font),
+        ('width', '_width', int),
+        ('height', '_height', int),
+        ('align', '_align', Align),
+        ('rotate', '_rotate', bool),
+    )
+
     def __init__(
             self,
             type: BarcodeType = BarcodeType,
@@ -458,33 +734,22 @@ class Barcode(BaseElement, AlignAtt, WidthAtt, HeightAtt, FontAtt, RotateAtt):
             align: Align = None,
             rotate: bool = None
     ):
-        super().__init__(
-            tag='barcode',
-            text=text,
-            font=font,
-            width=width, min_width=2, max_width=6,
-            height=height, min_height=0, max_height=255,
-            align=align,
-            rotate=rotate
-        )
+        super().__init__('barcode', text)
+        self.font = font
+        self.width = width
+        self.height = height
+        self.align = align
+        self._rotate = rotate
         self.type = type
         self.hri = hri
 
-    def _load_attrs(self):
-        self.attr['type'] = self.type.value
-        self.attr['hri'] = self.hri.value if self.hri else None
-        self.attr['font'] = self.font.value if self.font else None
-        self.attr['width'] = self.width
-        self.attr['height'] = self.height
-        self.attr['align'] = self.align.value if self.align else None
-        self.attr['rotate'] = self.rotate
-
     @property
     def type(self) -> BarcodeType:
         return self._type
 
     @type.setter
     def type(self, type: BarcodeType):
+        self._changed()
         try:
             type = BarcodeType(type)
         except TypeError:
@@ -500,6 +765,7 @@ class Barcode(BaseElement, AlignAtt, WidthAtt, HeightAtt, FontAtt, RotateAtt):
 
     @hri.setter
     def hri(self, hri: HRI):
+        self._changed()
         try:
             hri = HRI(hri)
         except ValueError:
@@ -511,79 +777,194 @@ class Barcode(BaseElement, AlignAtt, WidthAtt, HeightAtt, FontAtt, RotateAtt):
 
 
 class Symbol(BaseElement):  # TODO implement
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class HLine(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class VLineBegin(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class VLineEnd(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
-class Page(BaseElement):  # TODO implement
-    def __init__(self):
-        super().__init__('')
-        raise NotImplementedError()
+class Page(BaseElement):
+    """
+    Page mode section. The printer lays out all elements in the page and prints it in one pass.
+    Use Area, Direction and Position inside the page to place the other elements.
+    """
+    __slots__ = ('elements',)
 
+    def __init__(self, elements: Iterable[BaseElement] = ()):
+        super().__init__('page')
+        self.elements = list(elements)
 
-class Area(BaseElement):  # TODO implement
-    def __init__(self):
-        super().__init__('')
-        raise NotImplementedError()
+    def __repr__(self):
+        return f'{self.tag.upper()}: {self.elements}'
 
+    def add(self, element: BaseElement) -> None:
+        self._changed()
+        self.elements.append(element)
 
-class Direction(BaseElement):  # TODO implement
-    def __init__(self):
-        super().__init__('')
-        raise NotImplementedError()
+    def freeze(self):
+        for child in self.elements:
+            child.freeze()
+        return super().freeze()
 
+    def _lock(self):
+        for child in self.elements:
+            child._lock()
+        return super()._lock()
 
-class Position(BaseElement):  # TODO implement
-    def __init__(self):
-        super().__init__('')
-        raise NotImplementedError()
+    def to_xml(self):
+        element = super().to_xml()
+        for child in self.elements:
+            xml = child.to_xml()
+            if isinstance(xml, list):
+                element.extend(xml)
+            else:
+                element.append(xml)
+        return element
+
+    def _is_cached(self) -> bool:
+        return super()._is_cached() and all(child._is_cached() for child in self.elements)
+
+    def _write_xml(self, out: list[str]) -> None:
+        if self._frozen and not self._is_cached():
+            self._xml_cache = None
+        super()._write_xml(out)
+
+    def _serialize(self, out: list[str]) -> None:
+        if not self.elements:
+            out.append('<page/>')
+            return
+        out.append('<page>')
+        for child in self.elements:
+            child._write_xml(out)
+        out.append('</page>')
+
+
+class Area(BaseElement, XAtt, YAtt, WidthAtt, HeightAtt):
+    """Print area in page mode, all values are in dots"""
+    __slots__ = ('_x', '_y', '_width', '_height')
+
+    _min_x = 0
+    _max_x = 65535
+    _min_y = 0
+    _max_y = 65535
+    _min_width = 1
+    _max_width = 65535
+    _min_height = 1
+    _max_height = 65535
+
+    _attributes = (
+        ('x', '_x', int),
+        ('y', '_y', int),
+        ('width', '_width', int),
+        ('height', '_height', int),
+    )
+
+    def __init__(
+            self,
+            x: int,
+            y: int,
+            width: int,
+            height: int,
+    ):
+        super().__init__('area')
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+
+class Direction(BaseElement, DirAtt):
+    """Print direction in page mode"""
+    __slots__ = ('_dir',)
+
+    _attributes = (
+        ('dir', '_dir', Dir),
+    )
+
+    def __init__(self, dir: Dir = Dir.LEFT_TO_RIGHT):
+        super().__init__('direction')
+        self.dir = dir
+
+
+class Position(BaseElement, XAtt, YAtt):
+    """Print position in page mode, relative to the print area"""
+    __slots__ = ('_x', '_y')
+
+    _min_x = 0
+    _max_x = 65535
+    _min_y = 0
+    _max_y = 65535
+
+    _attributes = (
+        ('x', '_x', int),
+        ('y', '_y', int),
+    )
+
+    def __init__(self, x: int = 0, y: int = 0):
+        super().__init__('position')
+        self.x = x
+        self.y = y
 
 
 class Line(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class Rectangle(BaseElement):  # TODO implement
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class Cut(BaseElement):
+    __slots__ = ('_type',)
+
+    _attributes = (
+        ('type', '_type', CutType),
+    )
+
     def __init__(self, type: CutType = None):
         super().__init__('cut')
         self.type = type
 
-    def _load_attrs(self):
-        self.attr['type'] = self.type
-
     @property
     def type(self) -> CutType:
         return self._type
 
     @type.setter
     def type(self, type: CutType):
+        self._changed()
         try:
             type = CutType(type)
         except ValueError:
@@ -595,64 +976,78 @@ class Cut(BaseElement):
 
 
 class Pulse(BaseElement):  # TODO implement
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class Sound(BaseElement):  # TODO implement
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class Command(BaseElement):  # TODO implement
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class Layout(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class Recovery(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('recovery')
 
-    def _load_attrs(self):
-        pass
-
 
 class Reset(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('reset')
 
-    def _load_attrs(self):
-        pass
-
 
 class BatchBegin(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class BatchEnd(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class RotateBegin(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
 
 
 class RotateEnd(BaseElement):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__('')
         raise NotImplementedError()
@@ -0,0 +1,350 @@
+import threading
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .elements import (
+    EPOS_PRINT_NS, Area, Barcode, Cut, Direction, Feed, Image, Logo, Page, Position, Recovery, Reset, Response, Text,
+    _attr_value,
+)
+from .status import ASB
+
+_SOAP_NS = 'http://schemas.xmlsoap.org/soap/envelope/'
+
+# Element classes by tag, their _attributes tables describe the valid attributes
+_ELEMENTS = {
+    'text': Text,
+    'feed': Feed,
+    'image': Image,
+    'logo': Logo,
+    'barcode': Barcode,
+    'cut': Cut,
+    'page': Page,
+    'recovery': Recovery,
+    'reset': Reset,
+}
+_PAGE_ELEMENTS = {
+    'area': Area,
+    'direction': Direction,
+    'position': Position,
+}
+
+_REPLY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    f'<s:Envelope xmlns:s="{_SOAP_NS}"><s:Body>'
+    '<response success="{success}" code="{code}" status="{status}" battery="0" '
+    f'xmlns="{EPOS_PRINT_NS}"/>'
+    '</s:Body></s:Envelope>'
+)
+
+
+class SchemaError(ValueError):
+    """The request is not a valid epos-print document"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """A request received by the Emulator"""
+    devid: str
+    timeout: int
+    data: str
+    document: ET.Element | None
+    response: Response
+    received: float
+
+    @property
+    def tags(self) -> list[str]:
+        """Tags of the elements in the body, without namespace"""
+        if self.document is None:
+            return []
+        return [_local_name(child.tag) for child in self.document]
+
+
+class Emulator:
+    """
+    Local ePOS-Print server for load testing without a real printer.
+
+    It serves the SOAP endpoint that Printer sends its jobs to, validates the epos-print body against
+    the elements of this package and answers like a TM printer would.
+    Jobs are printed one at a time, every job with elements takes latency seconds.
+    Jobs that cannot start within their job timeout fail with EX_TIMEOUT, like on a printer that is busy.
+
+    with Emulator(latency=0.05) as emulator:
+        printer = Printer(emulator.address)
+        printer.print(doc)
+        emulator.jobs[-1].tags
+
+    The state can be changed while the server runs, e.g. emulator.paper_out = True
+    """
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            devid: str = 'local_printer',
+            url: str = '/cgi-bin/epos/service.cgi',
+            latency: float = 0.0,
+            paper_out: bool = False,
+            near_end: bool = False,
+            cover_open: bool = False,
+            busy: bool = False,
+    ):
+        """
+        :param port: Port to listen on, 0 picks a free port
+        :param latency: Seconds it takes to print a job
+        :param paper_out: Jobs fail with EPTR_REC_EMPTY
+        :param near_end: The roll paper near end flag is set in the status
+        :param cover_open: Jobs fail with EPTR_COVER_OPEN
+        :param busy: The printer is busy with a job from elsewhere, jobs fail with EX_TIMEOUT after their job timeout
+        """
+        self.devid = devid
+        self.url = url
+        self.latency = latency
+        self.paper_out = paper_out
+        self.near_end = near_end
+        self.cover_open = cover_open
+
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self._jobs: list[Job] = []
+        self._lock = threading.Lock()
+        self._mechanism = threading.Lock()
+        self._idle = threading.Event()
+        self.busy = busy
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.emulator = self
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __repr__(self):
+        return f'Emulator: {self.address}, {len(self._jobs)} jobs'
+
+    @property
+    def address(self) -> str:
+        """host:port to pass as ip to Printer"""
+        host, port = self._server.server_address[:2]
+        return f'{host}:{port}'
+
+    @property
+    def busy(self) -> bool:
+        return not self._idle.is_set()
+
+    @busy.setter
+    def busy(self, busy: bool):
+        if busy:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+    @property
+    def status(self) -> ASB:
+        """ASB flags that describe the current state, without the result of a job"""
+        status = ASB(0)
+        if self.near_end:
+            status |= ASB.RECEIPT_NEAR_END
+        if self.paper_out:
+            status |= ASB.RECEIPT_END | ASB.OFF_LINE
+        if self.cover_open:
+            status |= ASB.COVER_OPEN | ASB.OFF_LINE
+        return status
+
+    @property
+    def jobs(self) -> list[Job]:
+        """Received jobs, oldest first"""
+        with self._lock:
+            return list(self._jobs)
+
+    def clear(self) -> None:
+        """Forget the received jobs and reset the counters"""
+        with self._lock:
+            self._jobs.clear()
+            self.max_in_flight = self.in_flight
+
+    def start(self) -> None:
+        if self._thread is None:
+            # A short poll interval lets stop() return quickly, e.g. between tests
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={'poll_interval': 0.05},
+                name='epos-emulator',
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def _handle(self, devid: str, timeout: int, data: str) -> Response:
+        received = time.time()
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            document = None
+            try:
+                document = validate(data)
+            except SchemaError:
+                response = Response(False, 'SchemaError', int(self.status))
+            else:
+                response = self._print(devid, timeout, document)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        job = Job(devid, timeout, data, document, response, received)
+        with self._lock:
+            self._jobs.append(job)
+        return response
+
+    def _print(self, devid: str, timeout: int, document: ET.Element) -> Response:
+        if devid != self.devid:
+            return Response(False, 'DeviceNotFound', 0)
+
+        deadline = time.monotonic() + timeout / 1000
+        if not self._idle.wait(timeout / 1000):
+            return Response(False, 'EX_TIMEOUT', int(self.status))
+        if not self._mechanism.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            return Response(False, 'EX_TIMEOUT', int(self.status))
+        try:
+            if self.cover_open:
+                return Response(False, 'EPTR_COVER_OPEN', int(self.status))
+            if self.paper_out:
+                return Response(False, 'EPTR_REC_EMPTY', int(self.status))
+            if len(document) and self.latency:
+                time.sleep(self.latency)
+            return Response(True, '', int(self.status | ASB.PRINT_SUCCESS))
+        finally:
+            self._mechanism.release()
+
+
+def validate(data: str) -> ET.Element:
+    """
+    Check a SOAP request with an epos-print body.
+
+    :return: The epos-print element
+    :raises SchemaError: When the request is not valid
+    """
+    try:
+        envelope = ET.fromstring(data)
+    except ET.ParseError as e:
+        raise SchemaError(f'Invalid XML: {e}') from None
+
+    if envelope.tag != f'{{{_SOAP_NS}}}Envelope':
+        raise SchemaError(f'Expected a SOAP envelope, got {envelope.tag}')
+    body = envelope.find(f'{{{_SOAP_NS}}}Body')
+    if body is None or len(body) != 1:
+        raise SchemaError('The SOAP body must contain one epos-print element')
+    document = body[0]
+    if document.tag != f'{{{EPOS_PRINT_NS}}}epos-print':
+        raise SchemaError(f'Expected epos-print, got {document.tag}')
+
+    _validate_elements(document, _ELEMENTS)
+    return document
+
+
+def _validate_elements(parent: ET.Element, allowed: dict[str, type]) -> None:
+    for element in parent:
+        if not element.tag.startswith(f'{{{EPOS_PRINT_NS}}}'):
+            raise SchemaError(f'Element {element.tag} is not in the epos-print namespace')
+        tag = _local_name(element.tag)
+        cls = allowed.get(tag)
+        if cls is None:
+            raise SchemaError(f'Unexpected element {tag} in {_local_name(parent.tag)}')
+
+        _validate_attributes(tag, element.attrib, _valid_attributes(cls))
+        if cls is Page:
+            _validate_elements(element, _PAGE_ELEMENTS | {k: v for k, v in _ELEMENTS.items() if v is not Page})
+        elif len(element):
+            raise SchemaError(f'Element {tag} cannot contain other elements')
+
+
+def _validate_attributes(tag: str, attrib: dict[str, str], valid: dict[str, object]) -> None:
+    for name, value in attrib.items():
+        if name not in valid:
+            raise SchemaError(f'Unknown attribute {name} on {tag}')
+        kind = valid[name]
+        if kind is bool:
+            ok = value in ('true', 'false', '1', '0')
+        elif kind is int:
+            ok = value.isdigit()
+        else:
+            ok = value in kind
+        if not ok:
+            raise SchemaError(f'Invalid value {value!r} for attribute {name} on {tag}')
+
+
+_valid_attribute_cache: dict[type, dict[str, object]] = {}
+
+
+def _valid_attributes(cls: type) -> dict[str, object]:
+    """Attribute names of an element class, with bool, int or the set of valid enum values"""
+    valid = _valid_attribute_cache.get(cls)
+    if valid is None:
+        valid = {}
+        for name, _, kind, *_ in cls._attributes:
+            if kind in (bool, int):
+                valid[name] = kind
+            else:
+                valid[name] = {value for value in map(_attr_value, kind) if value is not None}
+        _valid_attribute_cache[cls] = valid
+    return valid
+
+
+def _local_name(tag: str) -> str:
+    return tag.rpartition('}')[2]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        emulator = self.server.emulator
+        url = urlsplit(self.path)
+        length = int(self.headers.get('content-length', 0))
+        data = self.rfile.read(length).decode('utf-8', errors='replace')
+        if url.path != emulator.url:
+            self._reply(404, b'')
+            return
+
+        query = parse_qs(url.query)
+        devid = query.get('devid', [''])[0]
+        try:
+            timeout = int(query.get('timeout', ['60000'])[0])
+        except ValueError:
+            timeout = 60000
+
+        response = emulator._handle(devid, timeout, data)
+        reply = _REPLY.format(
+            success=str(response.success).lower(),
+            code=response.code,
+            status=response.status,
+        )
+        self._reply(200, reply.encode('utf-8'))
+
+    def _reply(self, code: int, body: bytes) -> None:
+        try:
+            self.send_response(code)
+            self.send_header('content-type', 'text/xml; charset=utf-8')
+            self.send_header('content-length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, e.g. its request timeout is shorter than the latency
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
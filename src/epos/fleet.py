@@ -0,0 +1,172 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import requests
+
+from .document import EposDocument
+from .elements import Response
+from .printer import Printer
+
+
+@dataclass
+class _CachedStatus:
+    response: Response
+    timestamp: float
+
+
+class PrinterFleet:
+    """
+    Manage many printers at once.
+
+    Status checks and print jobs are run in parallel on a thread pool,
+    so one unreachable printer does not hold up the others.
+    The last known status of every printer is cached for status_ttl seconds.
+    """
+    def __init__(self, max_workers: int = 16, status_ttl: float = 30.0):
+        self.status_ttl = status_ttl
+        self._printers: dict[str, Printer] = {}
+        self._groups: dict[str, list[str]] = {}
+        self._cache: dict[str, _CachedStatus] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='epos-fleet')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._printers)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._printers))
+
+    def __getitem__(self, name: str) -> Printer:
+        return self._printers[name]
+
+    def close(self) -> None:
+        """Stop the worker threads and close the connections of all printers"""
+        self._executor.shutdown(wait=True)
+        for printer in self._printers.values():
+            printer.close()
+
+    def add(self, name: str, printer: Printer, groups: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._printers[name] = printer
+            for group in groups:
+                members = self._groups.setdefault(group, [])
+                if name not in members:
+                    members.append(name)
+
+    def remove(self, name: str) -> Printer:
+        with self._lock:
+            printer = self._printers.pop(name)
+            self._cache.pop(name, None)
+            for members in self._groups.values():
+                if name in members:
+                    members.remove(name)
+        return printer
+
+    def group(self, group: str) -> list[str]:
+        """Names of the printers in a group, in the order they were added"""
+        return list(self._groups.get(group, []))
+
+    def last_status(self, name: str) -> Response | None:
+        """
+        Cached status of a printer, without contacting it.
+
+        :return: Response, or None if there is no status younger than status_ttl
+        """
+        cached = self._cache.get(name)
+        if cached is None or time.monotonic() - cached.timestamp > self.status_ttl:
+            return None
+        return cached.response
+
+    def status(self, name: str) -> Response:
+        """Status of a printer, taken from the cache when still valid"""
+        response = self.last_status(name)
+        if response is None:
+            response = self._check(name)
+        return response
+
+    def poll(self, names: Iterable[str] = None) -> dict[str, Response]:
+        """
+        Check the status of all (or the given) printers in parallel, bypassing the cache.
+
+        :return: Dictionary with the printer name as key and the Response as value
+        """
+        names = list(self._printers) if names is None else list(names)
+        futures = {name: self._executor.submit(self._check, name) for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+    def print(self, name: str, doc: EposDocument, autocut: bool = True) -> Response:
+        return self._print(name, doc, autocut)
+
+    def print_many(self, jobs: Iterable[tuple[str, EposDocument]], autocut: bool = True) -> list[Response]:
+        """
+        Print multiple documents in parallel.
+
+        :param jobs: Pairs of printer name and document
+        :return: List of Responses in the same order as the jobs
+        """
+        futures = [self._executor.submit(self._print, name, doc, autocut) for name, doc in jobs]
+        return [future.result() for future in futures]
+
+    def first_ready(self, group: str) -> str | None:
+        """
+        Find a ready printer in a group.
+
+        Printers that are known to be ready from the cache are preferred in group order.
+        Otherwise, all printers without a valid cached status are checked in parallel
+        and the first one to answer successfully is returned.
+
+        :return: Name of the printer, or None if no printer in the group is ready
+        """
+        unknown = []
+        for name in self.group(group):
+            response = self.last_status(name)
+            if response is None:
+                unknown.append(name)
+            elif response.success:
+                return name
+
+        futures = {self._executor.submit(self._check, name): name for name in unknown}
+        for future in as_completed(futures):
+            if future.result().success:
+                return futures[future]
+        return None
+
+    def print_to_first_ready(
+            self,
+            group: str,
+            doc: EposDocument,
+            autocut: bool = True,
+    ) -> tuple[str | None, Response]:
+        """
+        Print a document on the first ready printer of a group.
+
+        :return: Tuple of the printer name and its Response. The name is None when no printer was ready.
+        """
+        name = self.first_ready(group)
+        if name is None:
+            return None, Response(success=False, code='NO_PRINTER_READY')
+        return name, self._print(name, doc, autocut)
+
+    def _check(self, name: str) -> Response:
+        return self._call(name, lambda printer: printer.print_empty())
+
+    def _print(self, name: str, doc: EposDocument, autocut: bool) -> Response:
+        return self._call(name, lambda printer: printer.print(doc, autocut=autocut))
+
+    def _call(self, name: str, func) -> Response:
+        try:
+            response = func(self._printers[name])
+        except requests.RequestException:
+            response = Response(success=False, code='CONNECTION_ERROR')
+
+        self._cache[name] = _CachedStatus(response, time.monotonic())
+        return response
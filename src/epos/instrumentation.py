@@ -0,0 +1,108 @@
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Protocol
+
+
+class Phase(Enum):
+    SERIALIZE = 'serialize'
+    ENVELOPE = 'envelope'
+    SEND = 'send'
+    PARSE = 'parse'
+
+
+@dataclass
+class JobMetrics:
+    """
+    Measurements of one request to a printer.
+
+    Timings are in seconds and only contain the phases that ran,
+    e.g. there is no SERIALIZE phase for Printer.print_xml().
+    """
+    printer: str
+    timings: dict[Phase, float] = field(default_factory=dict)
+    body_bytes: int = 0
+    payload_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    success: bool = False
+    code: str = ''
+    error: Exception | None = None
+
+    @property
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+
+class Instrumentation(Protocol):
+    """
+    Receives the metrics of every request of a Printer.
+
+    Called from the thread that sent the request, implementations must be thread-safe
+    when the printer is shared between threads.
+    """
+    def job_finished(self, metrics: JobMetrics) -> None:
+        ...
+
+
+@dataclass
+class PrinterStats:
+    jobs: int = 0
+    failures: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    codes: Counter = field(default_factory=Counter)
+    phase_totals: dict[Phase, float] = field(default_factory=dict)
+    phase_max: dict[Phase, float] = field(default_factory=dict)
+
+    def mean(self, phase: Phase) -> float:
+        """Average seconds per job spent in a phase"""
+        return self.phase_totals.get(phase, 0.0) / self.jobs if self.jobs else 0.0
+
+
+class MetricsRecorder:
+    """
+    Instrumentation that aggregates the metrics per printer, can be shared by many printers.
+
+    recorder = MetricsRecorder()
+    printer = Printer('10.0.0.12', instrumentation=recorder)
+    ...
+    recorder.stats['10.0.0.12'].mean(Phase.SEND)
+    """
+    def __init__(self):
+        self._stats: dict[str, PrinterStats] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'MetricsRecorder: {len(self._stats)} printers'
+
+    @property
+    def stats(self) -> dict[str, PrinterStats]:
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def job_finished(self, metrics: JobMetrics) -> None:
+        with self._lock:
+            stats = self._stats.get(metrics.printer)
+            if stats is None:
+                stats = self._stats[metrics.printer] = PrinterStats()
+
+            stats.jobs += 1
+            if metrics.error is not None:
+                stats.errors += 1
+            elif not metrics.success:
+                stats.failures += 1
+            stats.retries += metrics.retries
+            stats.bytes_sent += metrics.payload_bytes
+            stats.bytes_received += metrics.response_bytes
+            stats.codes[metrics.code] += 1
+            for phase, seconds in metrics.timings.items():
+                stats.phase_totals[phase] = stats.phase_totals.get(phase, 0.0) + seconds
+                stats.phase_max[phase] = max(stats.phase_max.get(phase, 0.0), seconds)
@@ -0,0 +1,241 @@
+import copy
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+from .constants import Align, Font
+from .elements import BaseElement, Feed, Text
+
+# Printable width of 80 mm paper in dots
+PAPER_WIDTH = 576
+
+# Width in dots of a half-width character, with width 1 and no double width
+CHAR_WIDTH = {
+    Font.A: 12,
+    Font.B: 9,
+}
+
+
+@lru_cache(maxsize=4096)
+def char_columns(char: str) -> int:
+    """
+    Number of half-width columns a character takes when printed.
+    East Asian wide characters take 2, combining and other zero width characters 0.
+    """
+    if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+
+def text_columns(text: str) -> int:
+    """Number of half-width columns a text takes when printed"""
+    if text.isascii():
+        return len(text)
+    return sum(map(char_columns, text))
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Column of a table.
+
+    :param width: Width in half-width characters, None shares the space that is left with other such columns
+    :param align: Alignment of the text in the column
+    :param wrap: Wrap text that is too long over multiple lines, otherwise it is truncated
+    """
+    width: int = None
+    align: Align = Align.LEFT
+    wrap: bool = True
+
+
+class Layout:
+    """
+    Lays out text in lines and columns that fit the paper.
+
+    Widths are counted in half-width characters of the font, scaled by width and double_width.
+
+    layout = Layout(font=Font.A)
+    lines = layout.table([('Fries', '2.50'), ('Coke', '1.80')], [Column(), Column(8, Align.RIGHT)])
+    doc.add_body(layout.text(lines))
+    """
+    def __init__(
+            self,
+            paper_width: int = PAPER_WIDTH,
+            font: Font = Font.A,
+            width: int = 1,
+            double_width: bool = False,
+    ):
+        """
+        :param paper_width: Printable width in dots
+        :param width: Character width multiplier, as the width attribute of Text
+        """
+        self.paper_width = paper_width
+        self.font = font
+        self.width = width
+        self.double_width = double_width
+
+    def __repr__(self):
+        return f'Layout: {self.columns} columns, {self.font}'
+
+    @property
+    def char_width(self) -> int:
+        """Width in dots of a half-width character"""
+        return CHAR_WIDTH[self.font] * self.width * (2 if self.double_width else 1)
+
+    @property
+    def columns(self) -> int:
+        """Number of half-width characters on a line"""
+        return self.paper_width // self.char_width
+
+    def text_width(self, text: str) -> int:
+        """Width of the text in dots"""
+        return text_columns(text) * self.char_width
+
+    def truncate(self, text: str, width: int = None) -> str:
+        """Cut the text to at most width columns, the full line by default"""
+        width = self.columns if width is None else width
+        if text_columns(text) <= width:
+            return text
+        used = 0
+        for i, char in enumerate(text):
+            used += char_columns(char)
+            if used > width:
+                return text[:i]
+        return text
+
+    def wrap(self, text: str, width: int = None) -> list[str]:
+        """
+        Split the text over lines of at most width columns, the full line by default.
+        Lines are broken at spaces when possible, words longer than a line are split.
+        """
+        width = self.columns if width is None else width
+        lines = []
+        for paragraph in text.split('\n'):
+            line = ''
+            used = 0
+            for word in paragraph.split(' '):
+                size = text_columns(word)
+                if line and used + 1 + size <= width:
+                    line += ' ' + word
+                    used += 1 + size
+                    continue
+                if line or used:
+                    lines.append(line)
+                while size > width:
+                    part = self.truncate(word, width)
+                    if not part:  # A wide character on a one column line
+                        part = word[0]
+                    lines.append(part)
+                    word = word[len(part):]
+                    size = text_columns(word)
+                line = word
+                used = size
+            lines.append(line)
+        return lines
+
+    def align(self, text: str, align: Align = Align.LEFT, width: int = None) -> str:
+        """Pad the text with spaces to exactly width columns, truncating it when it is too long"""
+        width = self.columns if width is None else width
+        text = self.truncate(text, width)
+        padding = width - text_columns(text)
+        if align is Align.RIGHT:
+            return ' ' * padding + text
+        if align is Align.CENTER:
+            left = padding // 2
+            return ' ' * left + text + ' ' * (padding - left)
+        return text + ' ' * padding
+
+    def column_widths(self, columns: Sequence[Column], gap: int = 1) -> list[int]:
+        """Widths of the columns, the columns without a width share the space that is left"""
+        fixed = sum(column.width for column in columns if column.width is not None)
+        flexible = [i for i, column in enumerate(columns) if column.width is None]
+        space = self.columns - fixed - gap * (len(columns) - 1)
+        if space < len(flexible) or (not flexible and space < 0):
+            raise ValueError(f'Columns do not fit in a line of {self.columns} characters')
+
+        widths = [column.width for column in columns]
+        for n, i in enumerate(flexible):
+            widths[i] = space // len(flexible) + (1 if n < space % len(flexible) else 0)
+        return widths
+
+    def row(self, cells: Sequence[str], columns: Sequence[Column], gap: int = 1) -> list[str]:
+        """
+        Lay out one row of a table.
+
+        :return: Lines of the row, more than one when a cell is wrapped
+        """
+        if len(cells) != len(columns):
+            raise ValueError(f'Expected {len(columns)} cells, got {len(cells)}')
+        return self._row(cells, columns, self.column_widths(columns, gap), gap)
+
+    def table(self, rows: Iterable[Sequence[str]], columns: Sequence[Column], gap: int = 1) -> list[str]:
+        """Lay out the rows of a table, see row()"""
+        widths = self.column_widths(columns, gap)
+        lines = []
+        for cells in rows:
+            if len(cells) != len(columns):
+                raise ValueError(f'Expected {len(columns)} cells, got {len(cells)}')
+            lines.extend(self._row(cells, columns, widths, gap))
+        return lines
+
+    def text(self, lines: Iterable[str], **attributes) -> Text:
+        """
+        One Text element that prints the lines, with the font and size of this layout.
+
+        :param attributes: Other Text attributes, like bold or align
+        """
+        return Text(
+            ''.join(line.rstrip(' ') + '\n' for line in lines),
+            font=self.font,
+            width=self.width if self.width != 1 else None,
+            double_width=self.double_width or None,
+            **attributes,
+        )
+
+    def _row(self, cells: Sequence[str], columns: Sequence[Column], widths: list[int], gap: int) -> list[str]:
+        cell_lines = []
+        for cell, column, width in zip(cells, columns, widths):
+            cell = str(cell)
+            cell_lines.append(self.wrap(cell, width) if column.wrap else [self.truncate(cell, width)])
+
+        separator = ' ' * gap
+        lines = []
+        for n in range(max(map(len, cell_lines))):
+            parts = []
+            for column_lines, column, width in zip(cell_lines, columns, widths):
+                text = column_lines[n] if n < len(column_lines) else ''
+                parts.append(self.align(text, column.align, width))
+            lines.append(separator.join(parts).rstrip(' '))
+        return lines
+
+
+def merge_elements(elements: Iterable[BaseElement]) -> list[BaseElement]:
+    """
+    Merge adjacent Text elements with the same attributes into one,
+    and adjacent Feed elements that only feed lines.
+    The elements themselves are not changed, merged elements are copies.
+    """
+    merged = []
+    for element in elements:
+        previous = merged[-1] if merged else None
+        if previous is None or previous.__class__ is not element.__class__:
+            merged.append(element)
+        elif isinstance(element, Text) and previous.attr == element.attr:
+            merged[-1] = _copy_with(previous, 'text', previous.text + element.text)
+        elif isinstance(element, Feed) and _lines_only(previous) and _lines_only(element) \
+                and previous.line + element.line <= 255:
+            merged[-1] = _copy_with(previous, 'line', previous.line + element.line)
+        else:
+            merged.append(element)
+    return merged
+
+
+def _lines_only(feed: Feed) -> bool:
+    return feed.line is not None and feed.attr.keys() == {'line'}
+
+
+def _copy_with(element: BaseElement, name: str, value) -> BaseElement:
+    element = copy.copy(element)
+    setattr(element, name, value)
+    return element
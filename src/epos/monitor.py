@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator, Callable, Mapping
+
+import requests
+
+from .elements import Response
+from .printer import UNREADABLE_CODES, Printer
+from .status import ASB, STATUS_TABLE, StatusInfo
+
+logger = logging.getLogger(__name__)
+
+# Every flag except PRINT_SUCCESS, which is set by every successful poll
+DEFAULT_WATCH = ASB(sum(info.flag for info in STATUS_TABLE)) & ~ASB.PRINT_SUCCESS
+
+_INFO = {info.flag: info for info in STATUS_TABLE}
+
+
+class EventKind(Enum):
+    FLAG_SET = 'flag_set'
+    FLAG_CLEARED = 'flag_cleared'
+    OFFLINE = 'offline'
+    ONLINE = 'online'
+
+
+@dataclass(frozen=True)
+class StatusEvent:
+    """
+    A change in the status of a printer.
+
+    FLAG_SET and FLAG_CLEARED carry the ASB flag that changed,
+    e.g. FLAG_SET with ASB.RECEIPT_NEAR_END when the paper runs low
+    and FLAG_CLEARED with the same flag once the roll is replaced.
+    """
+    printer: str
+    kind: EventKind
+    flag: ASB | None
+    response: Response | None
+    timestamp: float
+
+    def __str__(self):
+        if self.flag is None:
+            return f'{self.printer}: {self.kind.value}'
+        return f'{self.printer}: {self.kind.value} {self.flag.name}'
+
+    @property
+    def info(self) -> StatusInfo | None:
+        """Message, severity and category of the flag"""
+        return _INFO.get(self.flag)
+
+
+class _PrinterState:
+    def __init__(self):
+        self.status: int | None = None
+        self.online: bool | None = None
+        self.interval: float = 0.0
+        self.next_poll: float = 0.0
+        self.polling = False
+
+
+class StatusMonitor:
+    """
+    Poll printers in the background and report status changes.
+
+    Every poll sends an empty document. The ASB status is compared with the previous poll
+    and a StatusEvent is emitted for every watched flag that was set or cleared.
+    Printers that can not be reached are polled less often, up to max_interval seconds apart.
+
+    Events are delivered to the callbacks registered with subscribe(), from the polling threads,
+    or through the async iterator returned by events().
+    """
+    def __init__(
+            self,
+            printers: Mapping[str, Printer],
+            interval: float = 10.0,
+            max_interval: float = 300.0,
+            max_workers: int = 16,
+            watch: ASB = DEFAULT_WATCH,
+    ):
+        """
+        :param printers: Printers by name, a dict or a PrinterFleet
+        :param interval: Seconds between polls of a printer that is online
+        :param max_interval: Maximum seconds between polls of a printer that is offline
+        :param max_workers: Maximum number of printers that are polled at the same time
+        :param watch: ASB flags to report changes for
+        """
+        self.printers = printers
+        self.interval = interval
+        self.max_interval = max_interval
+        self.watch = ASB(watch)
+
+        self._max_workers = max_workers
+        self._executor = None
+        self._thread = None
+        self._states: dict[str, _PrinterState] = {}
+        self._subscribers: list[Callable[[StatusEvent], None]] = []
+        self._condition = threading.Condition()
+        self._running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def subscribe(self, callback: Callable[[StatusEvent], None]) -> Callable[[], None]:
+        """
+        Call callback for every event.
+
+        :return: Function that removes the subscription
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    async def events(self) -> AsyncIterator[StatusEvent]:
+        """Iterate over the events in an asyncio event loop"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        unsubscribe = self.subscribe(lambda event: loop.call_soon_threadsafe(queue.put_nowait, event))
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='epos-monitor')
+        self._thread = threading.Thread(target=self._run, name='epos-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the running polls to finish"""
+        if not self._running:
+            return
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def poll(self, name: str) -> list[StatusEvent]:
+        """Poll one printer now and return (and emit) the events"""
+        state = self._states.setdefault(name, _PrinterState())
+        try:
+            response = self.printers[name].print_empty()
+        except requests.RequestException:
+            response = None
+
+        events = self._update(name, state, response)
+        for event in events:
+            self._emit(event)
+        return events
+
+    def _update(self, name: str, state: _PrinterState, response: Response | None) -> list[StatusEvent]:
+        now = time.time()
+        events = []
+
+        if response is None or response.code in UNREADABLE_CODES:
+            # No status word, the last known status is kept until the printer answers again
+            if state.online is not False:
+                events.append(StatusEvent(name, EventKind.OFFLINE, None, response, now))
+            state.online = False
+            state.interval = min(max(state.interval * 2, self.interval), self.max_interval)
+            return events
+
+        if state.online is False:
+            events.append(StatusEvent(name, EventKind.ONLINE, None, response, now))
+        state.online = True
+        state.interval = self.interval
+
+        previous = state.status
+        state.status = response.status
+        if previous is None:
+            previous = 0
+
+        changed = (previous ^ response.status) & self.watch
+        for info in STATUS_TABLE:
+            if changed & info.flag:
+                kind = EventKind.FLAG_SET if response.status & info.flag else EventKind.FLAG_CLEARED
+                events.append(StatusEvent(name, kind, info.flag, response, now))
+        return events
+
+    def _emit(self, event: StatusEvent) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception('Status event subscriber failed')
+
+    def _run(self) -> None:
+        with self._condition:
+            while self._running:
+                now = time.monotonic()
+                for name in self.printers:
+                    state = self._states.setdefault(name, _PrinterState())
+                    if not state.polling and state.next_poll <= now:
+                        state.polling = True
+                        self._executor.submit(self._poll_job, name, state)
+
+                waiting = [s.next_poll for s in self._states.values() if not s.polling]
+                timeout = min(waiting) - now if waiting else self.interval
+                self._condition.wait(timeout=max(timeout, 0.01))
+
+    def _poll_job(self, name: str, state: _PrinterState) -> None:
+        try:
+            self.poll(name)
+        finally:
+            with self._condition:
+                state.next_poll = time.monotonic() + (state.interval or self.interval)
+                state.polling = False
+                self._condition.notify_all()
@@ -1,15 +1,47 @@
-import xml.etree.ElementTree as ET
+import time
+from typing import Generator, Iterable
+from xml.parsers import expat
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from urllib3.util.retry import Retry
 
-from .document import EposDocument
-from .elements import Cut, Response
+from .document import EposDocument, Fragment, _content_str, _join_str
+from .elements import BaseElement, Cut, Response
+from .instrumentation import Instrumentation, JobMetrics, Phase
 
 namespaces = {
     's': 'http://schemas.xmlsoap.org/soap/envelope/',
     'epos-print': 'http://www.epson-pos.com/schemas/2011/03/epos-print',
 }
 
+_SOAP_BODY = f'{namespaces["s"]}}}Body'
+_SOAP_PREFIX = f'<s:Envelope xmlns:s="{namespaces["s"]}"><s:Body>'
+_SOAP_SUFFIX = '</s:Body></s:Envelope>'
+# Bytes added to the epos-print body by the SOAP envelope
+SOAP_OVERHEAD = len((_SOAP_PREFIX + _SOAP_SUFFIX).encode('utf-8'))
+
+# Added to the serialized body when printing with autocut, the documents themselves are not changed
+_CUT = Cut().to_xml_str()
+
+# Maximum size of a request when documents are combined with print_batch()
+DEFAULT_BATCH_BYTES = 512 * 1024
+
+# Limits of a job sent by print_stream(), small enough to print well within the default job timeout
+DEFAULT_STREAM_BYTES = 64 * 1024
+DEFAULT_STREAM_ELEMENTS = 200
+
+# Codes of responses made up by _parse_response() when the reply could not be read,
+# their status is not a status word of the printer
+UNREADABLE_CODES = frozenset({'PARSING_ERROR', 'NO_BODY_FOUND', 'NO_RESPONSE_FOUND'})
+
+_HEADERS = {
+    'content-type': 'text/xml; charset=utf-8',
+    'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT',
+    'SOAPAction': '""',
+}
+
 
 class Printer:
     def __init__(
@@ -20,13 +52,50 @@ class Printer:
             devid: str = 'local_printer',
             job_timeout: int = 5000,
             url: str = '/cgi-bin/epos/service.cgi',
+            pool_size: int = 1,
+            retries: int | Retry = 0,
+            retry_backoff: float = 0.0,
+            instrumentation: Instrumentation = None,
+            max_payload: int = None,
     ):
+        """
+        :param pool_size: Number of keep-alive connections kept open to the printer
+        :param retries: Number of times to retry when no connection could be made,
+            or a urllib3 Retry object for full control.
+            The print job itself is never resent after it reached the printer.
+        :param retry_backoff: Backoff factor in seconds between connection retries
+        :param instrumentation: Receives the timings, sizes, retries and response code of every request,
+            see epos.instrumentation. Nothing is measured when it is None.
+        :param max_payload: Maximum size in bytes of a request. Larger documents are split between their elements
+            and sent as multiple jobs, the cut is only added to the last one.
+        """
         self.ip = ip
         self.request_timeout = request_timeout
         self.use_https = use_https
         self.devid = devid
         self.job_timeout = job_timeout
         self.url = url
+        self.instrumentation = instrumentation
+        self.max_payload = max_payload
+
+        if not isinstance(retries, Retry):
+            retries = Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=retry_backoff)
+        self._retries = retries
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update(_HEADERS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections to the printer"""
+        self._session.close()
 
     def printer_ready(self) -> bool:
         """
@@ -51,69 +120,386 @@ class Printer:
         return response
 
     def print(self, doc: EposDocument, autocut: bool = True) -> Response:
-        if autocut:
-            doc.add_body(Cut())
-        r = self._send_printjob(doc.body_to_str())
+        """
+        Print a document.
 
-        response = Response(success=False)
-        try:
-            xml_dom = ET.fromstring(r)
-        except ET.ParseError:
-            response.code = 'PARSING_ERROR'
-            return response
-
-        body = xml_dom.find('./s:Body', namespaces)
-        if not body:
-            response.code = 'NO_BODY_FOUND'
-            return response
-
-        for element in body:
-            if 'response' in element.tag:
-                attr = element.attrib
-                break
-        else:
-            response.code = 'NO_RESPONSE_FOUND'
-            return response
+        The cut is only added to the request, the document is not changed.
+        A document can be printed again or shared between threads without rebuilding it.
 
-        response.success = attr['success'] == 'true'
-        response.code = attr['code']
-        response.status = int(attr['status'])
-        response.battery = int(attr['battery'])
+        :return: Response
+        """
+        return self._run(_print_job(doc, autocut, self.max_payload))
 
-        return response
+    def print_batch(
+            self,
+            docs: Iterable[EposDocument],
+            autocut: bool = True,
+            max_bytes: int = DEFAULT_BATCH_BYTES,
+    ) -> list[Response]:
+        """
+        Print multiple documents in as few requests as possible.
+
+        The bodies of the documents are joined, with a Cut after every document when autocut is set,
+        until the epos-print body would exceed max_bytes. A larger document is sent on its own.
+        The documents themselves are not changed.
+        When max_payload is set, max_bytes is lowered to fit and larger documents are split over multiple requests.
+
+        :return: List with a Response per document, the Response of the request the document was part of
+            or the first failed Response of a split document. The rest of a split document is not sent
+            after one of its requests failed.
+        """
+        return self._run(_batch_job(docs, autocut, max_bytes, self.max_payload))
+
+    def print_stream(
+            self,
+            elements: Iterable[BaseElement],
+            autocut: bool = True,
+            max_bytes: int = DEFAULT_STREAM_BYTES,
+            max_elements: int = DEFAULT_STREAM_ELEMENTS,
+    ) -> Response:
+        """
+        Print a long sequence of elements, e.g. the lines of a journal from a generator, without building a document.
+
+        Elements are serialized as they come and sent in jobs of at most max_bytes and max_elements,
+        so memory use stays flat however long the print is. Keep the jobs small enough to print within job_timeout.
+        The cut is only added to the last job. An element larger than max_bytes is sent on its own.
+
+        :return: Response of the last job, or of the first job that failed, after which nothing more is sent
+        """
+        return self._run(_stream_job(elements, autocut, max_bytes, max_elements, self.max_payload))
+
+    def payload_size(self, doc: EposDocument, autocut: bool = True) -> int:
+        """
+        Size in bytes of the request that print() would send for the document, without sending it.
+        When it is larger than max_payload, print() splits the document.
+        """
+        return SOAP_OVERHEAD + len(_document_body(doc, autocut).encode('utf-8'))
+
+    def print_xml(self, data: str) -> Response:
+        """
+        Send an already serialized epos-print body to the printer,
+        e.g. the output of EposDocument.body_to_str() or Template.render()
+
+        :return: Response
+        """
+        if self.instrumentation is not None:
+            return self._print_instrumented(data, {})
+        r = self._send_printjob(data)
+        return _parse_response(r)
 
     def _send_printjob(self, data: str) -> str:
+        return self._post(_soap_payload(data)).text
+
+    def _run(self, job: 'PrintJob'):
+        """Send the bodies of a print job to the printer, see PrintJob"""
+        try:
+            # The job serializes the next body when it is resumed
+            start = time.perf_counter()
+            data = next(job)
+            while True:
+                try:
+                    if self.instrumentation is None:
+                        response = self.print_xml(data)
+                    else:
+                        response = self._print_instrumented(data, {Phase.SERIALIZE: time.perf_counter() - start})
+                except requests.RequestException as e:
+                    start = time.perf_counter()
+                    data = job.throw(e)
+                    continue
+                start = time.perf_counter()
+                data = job.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+    def _post(self, payload: bytes) -> requests.Response:
         prefix = 'https://' if self.use_https else 'http://'
         url = prefix + self.ip + self.url
-        headers = {
-            'content-type': 'text/xml; charset=utf-8',
-            'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT',
-            'SOAPAction': '""',
-        }
         params = {'devid': self.devid, 'timeout': self.job_timeout}
 
-        response = requests.post(
+        return self._session.post(
             url,
-            data=_add_soap_enveloppe(data),
-            headers=headers,
+            data=payload,
             params=params,
             timeout=self.request_timeout,
         )
 
-        return response.text
+    def _print_instrumented(self, data: str, timings: dict[Phase, float]) -> Response:
+        """print_xml() that measures every phase and reports it to the instrumentation"""
+        start = time.perf_counter()
+        payload = _soap_payload(data)
+        sent = time.perf_counter()
+        timings[Phase.ENVELOPE] = sent - start
+        metrics = JobMetrics(self.ip, timings, len(payload) - SOAP_OVERHEAD, len(payload))
+
+        try:
+            r = self._post(payload)
+            text = r.text
+        except requests.RequestException as e:
+            timings[Phase.SEND] = time.perf_counter() - sent
+            metrics.code = 'CONNECTION_ERROR'
+            metrics.error = e
+            if _connect_failed(e):
+                # All connection retries were used up
+                connect = self._retries.connect
+                metrics.retries = connect if connect is not None else self._retries.total or 0
+            self.instrumentation.job_finished(metrics)
+            raise
+        received = time.perf_counter()
+        timings[Phase.SEND] = received - sent
+        metrics.response_bytes = len(r.content)
+        retries = getattr(r.raw, 'retries', None)
+        if retries is not None:
+            metrics.retries = len(retries.history)
+
+        response = _parse_response(text)
+        timings[Phase.PARSE] = time.perf_counter() - received
+        metrics.success = response.success
+        metrics.code = response.code
+        self.instrumentation.job_finished(metrics)
+        return response
+
+
+def _connect_failed(error: requests.RequestException) -> bool:
+    """The request failed because no connection could be made, so the printer did not receive it"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    return isinstance(reason, MaxRetryError) and isinstance(reason.reason, NewConnectionError)
+
+
+# Control flow of a print, shared by Printer and AsyncPrinter: a generator that yields the epos-print bodies
+# to send and receives the Response of each request. Its return value is the result of the print.
+# Printer throws the exception of a failed request into it.
+PrintJob = Generator[str, Response, object]
+
+
+def _print_job(doc: EposDocument, autocut: bool, max_payload: int | None) -> PrintJob:
+    """Print a document, split in requests of at most max_payload bytes when it is set"""
+    if max_payload is None:
+        return (yield _document_body(doc, autocut))
+
+    response = None
+    for data, _ in _batch_bodies([doc], autocut, max_payload - SOAP_OVERHEAD, True):
+        response = yield data
+        if not response.success:
+            break
+    return response
+
+
+def _batch_job(docs: Iterable[EposDocument], autocut: bool, max_bytes: int, max_payload: int | None) -> PrintJob:
+    """Print documents in as few requests as possible, returns a Response per document"""
+    split = max_payload is not None
+    if split:
+        max_bytes = min(max_bytes, max_payload - SOAP_OVERHEAD)
+
+    responses = []
+    failed = None
+    for data, count in _batch_bodies(docs, autocut, max_bytes, split):
+        if failed is not None:
+            # Skip the rest of a split document after a part of it failed
+            if count:
+                responses.append(failed)
+                failed = None
+            continue
+
+        response = yield data
+        if count:
+            responses.extend([response] * count)
+        elif not response.success:
+            failed = response
+    return responses
+
+
+def _stream_job(
+        elements: Iterable[BaseElement],
+        autocut: bool,
+        max_bytes: int,
+        max_elements: int,
+        max_payload: int | None,
+) -> PrintJob:
+    """Print a sequence of elements in jobs of limited size, stops at the first failed job"""
+    if max_payload is not None:
+        max_bytes = min(max_bytes, max_payload - SOAP_OVERHEAD)
+
+    response = None
+    for data in _stream_bodies(elements, autocut, max_bytes, max_elements):
+        response = yield data
+        if not response.success:
+            break
+    return response
+
+
+def _document_body(doc: EposDocument, autocut: bool) -> str:
+    """Serialized epos-print body of a document, with a cut at the end when autocut is set"""
+    return doc._body_str(_CUT if autocut else '')
+
+
+# Bytes added to the content by the epos-print base tag
+_BODY_OVERHEAD = len(_join_str('epos-print', ['-'])) - 1
+
+
+def _batch_bodies(
+        docs: Iterable[EposDocument],
+        autocut: bool,
+        max_bytes: int,
+        split: bool = False,
+) -> Iterable[tuple[str, int]]:
+    """
+    Group documents into epos-print bodies of at most max_bytes.
+
+    :param split: Split documents that do not fit in max_bytes between their elements,
+        instead of sending them on their own. The parts of a split document are not combined with other documents,
+        so a body with 0 documents ending in it only holds a part of the document that ends in the next body.
+    :return: Tuples of the serialized body and the number of documents that end in it
+    """
+    cut = _CUT if autocut else ''
+
+    contents = []
+    size = _BODY_OVERHEAD
+    count = 0
+    for doc in docs:
+        is_split = False
+        for content, content_size, ends in _document_contents(doc, cut, max_bytes if split else None):
+            if contents and (size + content_size > max_bytes or (not ends and not is_split)):
+                yield _join_str('epos-print', contents), count
+                contents = []
+                size = _BODY_OVERHEAD
+                count = 0
+            is_split = is_split or not ends
+            contents.append(content)
+            size += content_size
+            count += ends
+
+        if is_split:
+            yield _join_str('epos-print', contents), count
+            contents = []
+            size = _BODY_OVERHEAD
+            count = 0
+
+    if contents:
+        yield _join_str('epos-print', contents), count
+
+
+def _stream_bodies(
+        elements: Iterable[BaseElement],
+        autocut: bool,
+        max_bytes: int,
+        max_elements: int,
+) -> Iterable[str]:
+    """
+    Serialize elements into epos-print bodies of at most max_bytes and max_elements, one element at a time.
+    Yields at least one body, with the cut at the end of the last one.
+    """
+    contents = []
+    size = _BODY_OVERHEAD
+    for element in _flatten(elements):
+        out = []
+        element._write_xml(out)
+        content = ''.join(out)
+        content_size = len(content.encode('utf-8'))
+        if contents and (size + content_size > max_bytes or len(contents) >= max_elements):
+            yield _join_str('epos-print', contents)
+            contents = []
+            size = _BODY_OVERHEAD
+        contents.append(content)
+        size += content_size
+
+    if autocut:
+        if contents and size + len(_CUT) > max_bytes:
+            yield _join_str('epos-print', contents)
+            contents = []
+        contents.append(_CUT)
+    yield _join_str('epos-print', contents)
+
+
+def _document_contents(doc: EposDocument, cut: str, max_bytes: int | None) -> Iterable[tuple[str, int, int]]:
+    """
+    Serialized content of a document, in pieces that fit in max_bytes when it is set.
+
+    :return: Tuples of the content, its size in bytes and 1 for the last piece of the document
+    """
+    content = doc._content() + cut
+    size = len(content.encode('utf-8'))
+    if max_bytes is None or size + _BODY_OVERHEAD <= max_bytes:
+        yield content, size, 1
+        return
+
+    elements = list(_flatten(doc.body))
+    for i, element in enumerate(elements):
+        content = _content_str([element])
+        if i == len(elements) - 1:
+            content += cut
+        size = len(content.encode('utf-8'))
+        if size + _BODY_OVERHEAD > max_bytes:
+            raise ValueError(
+                f'{element.tag} element of {size} bytes does not fit in a request of {max_bytes + SOAP_OVERHEAD} bytes'
+            )
+        yield content, size, int(i == len(elements) - 1)
+
+
+def _flatten(elements: Iterable[BaseElement | Fragment]) -> Iterable[BaseElement]:
+    """Elements with the content of fragments, the smallest parts a document can be split in"""
+    for element in elements:
+        if isinstance(element, Fragment):
+            yield from _flatten(element.elements)
+        else:
+            yield element
+
+
+class _ResponseFound(Exception):
+    pass
+
+
+def _parse_response(data: str) -> Response:
+    """
+    Parse the SOAP reply of the printer into a Response.
+
+    Only scans the XML until the response element is found, no tree is built.
+    """
+    depth = 0
+    in_body = False
+    body_children = 0
+
+    def start(name, attrs):
+        nonlocal depth, in_body, body_children
+        if depth == 1 and name == _SOAP_BODY:
+            in_body = True
+        elif depth == 2 and in_body:
+            body_children += 1
+            if 'response' in name:
+                raise _ResponseFound(attrs)
+        depth += 1
+
+    def end(name):
+        nonlocal depth, in_body
+        depth -= 1
+        if depth == 1:
+            in_body = False
+
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+
+    response = Response(success=False)
+    try:
+        parser.Parse(data, True)
+    except _ResponseFound as found:
+        attr = found.args[0]
+    except expat.ExpatError:
+        response.code = 'PARSING_ERROR'
+        return response
+    else:
+        response.code = 'NO_RESPONSE_FOUND' if body_children else 'NO_BODY_FOUND'
+        return response
 
+    response.success = attr['success'] == 'true'
+    response.code = attr['code']
+    response.status = int(attr['status'])
+    response.battery = int(attr['battery'])
 
-def _add_soap_enveloppe(body: str, header: str = '') -> str:
-    """Add the soap enveloppe, header and body"""
-    soap = [f'<s:Envelope xmlns:s="{namespaces["s"]}">']
+    return response
 
-    if header:
-        soap.append('<s:Header>')
-        soap.append(header)
-        soap.append('/<s:Header>')
-    soap.append('<s:Body>')
-    soap.append(body)
-    soap.append('</s:Body>')
-    soap.append('</s:Envelope>')
 
-    return ''.join(soap)
+def _soap_payload(body: str) -> bytes:
+    """The SOAP request for an epos-print body, encoded as UTF-8"""
+    return ''.join((_SOAP_PREFIX, body, _SOAP_SUFFIX)).encode('utf-8')
@@ -0,0 +1,318 @@
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .constants import Align, Color, Mode
+from .elements import Image
+
+_BAYER_2 = [[0, 2], [3, 1]]
+
+
+def _bayer_matrix(size: int) -> 'np.ndarray':
+    """Ordered dither threshold map with values between 0 and 1"""
+    matrix = np.array(_BAYER_2)
+    while matrix.shape[0] < size:
+        matrix = np.block([
+            [4 * matrix, 4 * matrix + 2],
+            [4 * matrix + 3, 4 * matrix + 1],
+        ])
+    return (matrix + 0.5) / matrix.size
+
+
+class Dither(Enum):
+    NONE = 'none'
+    FLOYD_STEINBERG = 'floyd_steinberg'
+    BAYER = 'bayer'
+
+
+class RasterCache:
+    """
+    LRU cache of converted images, keyed by a hash of the image content and the conversion options.
+
+    The size of the cache is limited by the total size of the base64 payloads in memory.
+    When a directory is given, payloads are also stored on disk and survive a restart.
+    """
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, directory: str | Path = None):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, tuple[str, int, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return (f'RasterCache: {len(self)} entries, {self._size} bytes, '
+                f'hits: {self.hits}, disk hits: {self.disk_hits}, misses: {self.misses}')
+
+    @property
+    def size(self) -> int:
+        """Bytes used by the payloads in memory"""
+        return self._size
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def get(self, key: str) -> tuple[str, int, int] | None:
+        """
+        :return: Tuple of the base64 payload, width and height, or None when the key is unknown
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self._store(key, entry)
+        return entry
+
+    def put(self, key: str, entry: tuple[str, int, int]) -> None:
+        with self._lock:
+            self._store(key, entry)
+        self._save(key, entry)
+
+    def clear(self) -> None:
+        """Empty the cache in memory and reset the counters, files on disk are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.disk_hits = self.misses = 0
+
+    def _store(self, key: str, entry: tuple[str, int, int]) -> None:
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old[0])
+        self._entries[key] = entry
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (payload, _, _) = self._entries.popitem(last=False)
+            self._size -= len(payload)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.b64'
+
+    def _load(self, key: str) -> tuple[str, int, int] | None:
+        if self.directory is None:
+            return None
+        try:
+            header, payload = self._path(key).read_text('ascii').split('\n', 1)
+            width, height = header.split()
+            return payload, int(width), int(height)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key: str, entry: tuple[str, int, int]) -> None:
+        if self.directory is None:
+            return
+        payload, width, height = entry
+        path = self._path(key)
+        tmp = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp.write_text(f'{width} {height}\n{payload}', 'ascii')
+        os.replace(tmp, path)
+
+
+def cache_key(image, mode: Mode, dither: Dither, threshold: int) -> str:
+    """Hash of the image content and the conversion options"""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f'{Mode(mode).value}:{Dither(dither).value}:{threshold}:'.encode())
+    if hasattr(image, 'convert'):  # PIL image
+        h.update(f'{image.mode}:{image.size}:'.encode())
+        h.update(image.tobytes())
+        # Palette images with the same indices look different with another palette
+        palette = image.getpalette()
+        if palette is not None:
+            h.update(bytes(palette))
+        h.update(repr(image.info.get('transparency')).encode())
+    else:
+        image = np.ascontiguousarray(image)
+        h.update(f'{image.dtype.str}:{image.shape}:'.encode())
+        h.update(image.data)
+    return h.hexdigest()
+
+
+def to_raster(
+        image,
+        mode: Mode = Mode.MONO,
+        dither: Dither = Dither.FLOYD_STEINBERG,
+        threshold: int = 128,
+) -> tuple[bytes, int, int]:
+    """
+    Convert an image to the raster format of the image element.
+
+    MONO packs 8 dots per byte, a set bit prints a dot.
+    GRAY16 packs 2 dots per byte, with 4 bits per dot from 0 (white) to 15 (black).
+    Every row is padded with white dots to a whole number of bytes.
+
+    :param image: PIL image or NumPy array.
+        Arrays can be grayscale (height, width), RGB or RGBA (height, width, 3 or 4).
+        Integer arrays use 0-255, float arrays 0.0-1.0 and in boolean arrays True prints a dot.
+    :param threshold: Gray value below which a dot is printed, for MONO without dithering
+    :return: Tuple of the raster data, width and height
+    """
+    if np is None:
+        raise ImportError('Image conversion requires numpy, install it with: pip install ePos-Print-XML[image]')
+
+    mode = Mode(mode)
+    dither = Dither(dither)
+    gray = _to_gray(image)
+    height, width = gray.shape
+
+    if mode is Mode.MONO:
+        levels = 2
+    else:
+        levels = 16
+    step = 255 / (levels - 1)
+
+    if dither is Dither.FLOYD_STEINBERG:
+        gray = _floyd_steinberg(gray, levels, threshold)
+    elif dither is Dither.BAYER:
+        bayer = _bayer_matrix(8)
+        offsets = np.tile(bayer, (height // 8 + 1, width // 8 + 1))[:height, :width]
+        if levels == 2:
+            gray = np.where(gray < offsets * 255, 0.0, 255.0)
+        else:
+            gray = gray + (offsets - 0.5) * step
+    elif levels == 2:
+        gray = np.where(gray < threshold, 0.0, 255.0)
+
+    # Darkness of every dot, 0 is white
+    dots = (levels - 1) - np.clip(np.rint(gray / step), 0, levels - 1).astype(np.uint8)
+
+    if mode is Mode.MONO:
+        raster = np.packbits(dots, axis=1)
+    else:
+        if width % 2:
+            dots = np.pad(dots, ((0, 0), (0, 1)))
+        raster = (dots[:, 0::2] << 4) | dots[:, 1::2]
+    return raster.tobytes(), width, height
+
+
+def to_image(
+        image,
+        mode: Mode = Mode.MONO,
+        dither: Dither = Dither.FLOYD_STEINBERG,
+        threshold: int = 128,
+        align: Align = None,
+        color: Color = None,
+        cache: RasterCache = None,
+) -> Image:
+    """
+    Convert an image to an Image element, see to_raster() for the supported images.
+
+    :param cache: RasterCache to look up the converted payload, useful for logos printed on every receipt
+    :return: Image
+    """
+    entry = None
+    if cache is not None:
+        key = cache_key(image, mode, dither, threshold)
+        entry = cache.get(key)
+
+    if entry is None:
+        raster, width, height = to_raster(image, mode=mode, dither=dither, threshold=threshold)
+        entry = base64.b64encode(raster).decode('ascii'), width, height
+        if cache is not None:
+            cache.put(key, entry)
+
+    payload, width, height = entry
+    return Image(
+        width=width,
+        height=height,
+        text=payload,
+        color=color,
+        align=align,
+        mode=mode,
+    )
+
+
+def _to_gray(image) -> 'np.ndarray':
+    """Convert to a float array with gray values between 0 (black) and 255 (white)"""
+    if hasattr(image, 'convert'):  # PIL image
+        if image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        image = np.asarray(image)
+
+    image = np.asarray(image)
+    if image.dtype == bool:
+        image = np.where(image, 0.0, 255.0)
+    elif np.issubdtype(image.dtype, np.floating):
+        image = image * 255.0
+    image = image.astype(np.float32)
+
+    if image.ndim == 3:
+        if image.shape[2] not in (3, 4):
+            raise ValueError('Color images must have 3 (RGB) or 4 (RGBA) channels')
+        gray = image[:, :, 0] * 0.299 + image[:, :, 1] * 0.587 + image[:, :, 2] * 0.114
+        if image.shape[2] == 4:
+            # Transparent parts are printed as white paper
+            alpha = image[:, :, 3] / 255.0
+            gray = gray * alpha + 255.0 * (1.0 - alpha)
+        image = gray
+    elif image.ndim != 2:
+        raise ValueError('Image must be a 2D grayscale or 3D color array')
+
+    if image.shape[1] > 576:
+        raise ValueError('Image can be at most 576 dots wide')
+    return image
+
+
+def _floyd_steinberg(gray: 'np.ndarray', levels: int, threshold: int) -> 'np.ndarray':
+    """
+    Floyd-Steinberg error diffusion, vectorized over anti-diagonals.
+
+    A dot only depends on its left neighbour and the three dots above it,
+    so all dots on a line x + 2y = t can be quantized at the same time.
+    """
+    height, width = gray.shape
+    step = 255 / (levels - 1)
+
+    # One extra row below and a column on both sides catch the error that falls off the image
+    buf = np.zeros((height + 1, width + 2), dtype=np.float32)
+    buf[:height, 1:width + 1] = gray
+    out = np.empty_like(gray)
+
+    for t in range(width + 2 * (height - 1)):
+        ys = np.arange(max(0, (t - width + 2) // 2), min(height - 1, t // 2) + 1)
+        xs = t - 2 * ys + 1
+
+        old = buf[ys, xs]
+        if levels == 2:
+            new = np.where(old < threshold, 0.0, 255.0)
+        else:
+            new = np.clip(np.rint(old / step), 0, levels - 1) * step
+        out[ys, xs - 1] = new
+
+        error = old - new
+        buf[ys, xs + 1] += error * (7 / 16)
+        buf[ys + 1, xs - 1] += error * (3 / 16)
+        buf[ys + 1, xs] += error * (5 / 16)
+        buf[ys + 1, xs + 1] += error * (1 / 16)
+    return out
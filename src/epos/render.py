@@ -0,0 +1,69 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from .document import EposDocument
+from .printer import _document_body
+
+DocumentSource = EposDocument | Callable[[], EposDocument]
+
+
+def render_many(
+        docs: Iterable[DocumentSource],
+        autocut: bool = True,
+        max_workers: int = None,
+        chunksize: int = 16,
+        executor: Executor = None,
+) -> Iterator[str]:
+    """
+    Serialize many documents in parallel on a process pool.
+
+    The serialized bodies are yielded in the order of docs, as soon as they are ready,
+    and can be sent with Printer.print_xml(). Only a few chunks of documents are in flight at a time,
+    so docs can be a generator of any length.
+
+    Documents are pickled to the worker processes. Instead of a document, a zero argument function that
+    builds it can be given, e.g. functools.partial(make_voucher, code). It is called in the worker process,
+    so expensive work like converting images with epos.raster happens there as well.
+    Functions must be picklable: defined at module level, or a partial of one.
+
+    for body in render_many(partial(make_voucher, code) for code in codes):
+        printer.print_xml(body)
+
+    :param max_workers: Number of processes, defaults to the number of CPUs
+    :param chunksize: Number of documents sent to a worker at once
+    :param executor: Existing executor to use instead of starting a new process pool
+    """
+    workers = max_workers or os.cpu_count() or 1
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    docs = iter(docs)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(docs, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_render_chunk, chunk, autocut))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _render_chunk(docs: list[DocumentSource], autocut: bool) -> list[str]:
+    bodies = []
+    for doc in docs:
+        if callable(doc):
+            doc = doc()
+        bodies.append(_document_body(doc, autocut))
+    return bodies
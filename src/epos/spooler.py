@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable
+
+import requests
+
+from .document import EposDocument
+from .elements import Response
+from .printer import Printer, PrintJob, _connect_failed, _print_job
+
+# Response codes after which resending the job can succeed
+TRANSIENT_CODES = frozenset({
+    'EX_TIMEOUT',
+    'EX_SPOOLER',
+    'EX_ENPC_TIMEOUT',
+    'EX_BADPORT',
+    'CONNECTION_ERROR',
+})
+
+
+class QueuePolicy(Enum):
+    WAIT = 'wait'
+    REJECT = 'reject'
+
+
+class SpoolerFull(Exception):
+    """Raised when a job is submitted to a full spooler with the REJECT policy"""
+
+
+class SpoolerClosed(Exception):
+    """Raised when a job is submitted to a closed spooler"""
+
+
+@dataclass
+class _Job:
+    doc: EposDocument
+    autocut: bool
+    future: Future
+
+
+class Spooler:
+    """
+    Background print queue for a single printer.
+
+    Jobs are sent one at a time, in the order they were submitted.
+    Every submitted job returns a concurrent.futures.Future with the Response of the printer.
+    Use asyncio.wrap_future() to await it from asyncio code.
+    """
+    def __init__(
+            self,
+            printer: Printer,
+            maxsize: int = 100,
+            policy: QueuePolicy = QueuePolicy.WAIT,
+            retries: int = 3,
+            retry_delay: float = 1.0,
+            retry_codes: Iterable[str] = TRANSIENT_CODES,
+    ):
+        """
+        :param maxsize: Maximum number of waiting jobs, 0 for unlimited
+        :param policy: What to do when the queue is full: wait for a free place or raise SpoolerFull
+        :param retries: Number of times a job is resent when the printer returns a code from retry_codes,
+            or no connection could be made. A job that timed out or lost its connection after it was sent
+            is never resent, the printer may already have printed it; the Future gets the exception instead.
+            When the printer splits a document with max_payload, only the request that failed is resent.
+        :param retry_delay: Seconds to wait before resending a job
+        """
+        self.printer = printer
+        self.policy = QueuePolicy(policy)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.retry_codes = frozenset(retry_codes)
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        # Held while a job is added, so close() cannot put the stop sentinel in between
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f'epos-spooler-{printer.ip}', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        """Approximate number of waiting jobs"""
+        return self._queue.qsize()
+
+    def submit(self, doc: EposDocument, autocut: bool = True, timeout: float = None) -> Future:
+        """
+        Add a document to the queue.
+
+        :param timeout: Maximum time in seconds to wait for a free place with the WAIT policy
+        :return: Future that resolves to the Response of the printer
+        """
+        job = _Job(doc, autocut, Future())
+        with self._lock:
+            if self._closed:
+                raise SpoolerClosed('The spooler is closed')
+            try:
+                if self.policy is QueuePolicy.REJECT:
+                    self._queue.put_nowait(job)
+                else:
+                    self._queue.put(job, timeout=timeout)
+            except queue.Full:
+                raise SpoolerFull(f'The queue of printer {self.printer.ip} is full') from None
+        return job.future
+
+    def close(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop accepting jobs and stop the worker once the queue is empty.
+
+        :param wait: Block until all remaining jobs are done
+        :param cancel_pending: Cancel the jobs that are still waiting in the queue
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+            if cancel_pending:
+                while True:
+                    try:
+                        self._queue.get_nowait().future.cancel()
+                    except queue.Empty:
+                        break
+            self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                job.future.set_result(self._print(job))
+            except Exception as e:
+                job.future.set_exception(e)
+
+    def _print(self, job: _Job) -> Response:
+        return self.printer._run(self._retry(_print_job(job.doc, job.autocut, self.printer.max_payload)))
+
+    def _retry(self, job: PrintJob) -> PrintJob:
+        """Print job that resends a request of job after a transient failure, the parts that printed are not resent"""
+        try:
+            data = next(job)
+        except StopIteration as stop:
+            return stop.value
+
+        while True:
+            attempt = 0
+            while True:
+                try:
+                    response = yield data
+                except requests.ConnectionError as e:
+                    # Only when no connection could be made the job did not reach the printer
+                    if not _connect_failed(e) or attempt >= self.retries:
+                        raise
+                    response = Response(success=False, code='CONNECTION_ERROR')
+
+                if response.success or response.code not in self.retry_codes or attempt >= self.retries:
+                    break
+                attempt += 1
+                time.sleep(self.retry_delay)
+
+            try:
+                data = job.send(response)
+            except StopIteration as stop:
+                return stop.value
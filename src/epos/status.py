@@ -1,43 +1,94 @@
+from dataclasses import dataclass
+from enum import Enum, IntFlag
+from functools import lru_cache
+
+
+class ASB(IntFlag):
+    """Automatic Status Back flags of the status attribute in a response"""
+    NO_RESPONSE = 0x00000001
+    PRINT_SUCCESS = 0x00000002
+    DRAWER_KICK = 0x00000004
+    OFF_LINE = 0x00000008
+    COVER_OPEN = 0x00000020
+    PAPER_FEED = 0x00000040
+    WAIT_ON_LINE = 0x00000100
+    PANEL_SWITCH = 0x00000200
+    MECHANICAL_ERR = 0x00000400
+    AUTOCUTTER_ERR = 0x00000800
+    UNRECOVER_ERR = 0x00002000
+    AUTORECOVER_ERR = 0x00004000
+    WAIT_SLIP_INSERTION = 0x00010000
+    RECEIPT_NEAR_END = 0x00020000
+    WAIT_SLIP_EJECTION = 0x00040000
+    RECEIPT_END = 0x00080000
+    BUZZER = 0x01000000
+    REMOVAL_DETECT_PAPER_NONE = 0x04000000
+    SPOOLER_IS_STOPPED = 0x80000000
+
+
+class Severity(Enum):
+    INFO = 1
+    WARNING = 2
+    ERROR = 3
+
+
+class Category(Enum):
+    PRINTER = 'printer'
+    PAPER = 'paper'
+    COVER = 'cover'
+    DRAWER = 'drawer'
+    SLIP = 'slip'
+    MECHANISM = 'mechanism'
+    SPOOLER = 'spooler'
+
+
+@dataclass(frozen=True)
+class StatusInfo:
+    flag: ASB
+    message: str
+    severity: Severity
+    category: Category
+    recoverable: bool
+
+
+STATUS_TABLE = (
+    StatusInfo(ASB.NO_RESPONSE, 'No printer response', Severity.ERROR, Category.PRINTER, True),
+    StatusInfo(ASB.PRINT_SUCCESS, 'Printing is successfully completed', Severity.INFO, Category.PRINTER, True),
+    StatusInfo(ASB.DRAWER_KICK, 'Status of the drawer kick number 3 connector pin = "H"',
+               Severity.INFO, Category.DRAWER, True),
+    StatusInfo(ASB.OFF_LINE, 'Offline status', Severity.WARNING, Category.PRINTER, True),
+    StatusInfo(ASB.COVER_OPEN, 'Cover is open', Severity.ERROR, Category.COVER, True),
+    StatusInfo(ASB.PAPER_FEED, 'Paper feed switch is feeding paper', Severity.INFO, Category.PAPER, True),
+    StatusInfo(ASB.WAIT_ON_LINE, 'Waiting for online recovery', Severity.WARNING, Category.PRINTER, True),
+    StatusInfo(ASB.PANEL_SWITCH, 'Panel switch is ON', Severity.INFO, Category.PRINTER, True),
+    StatusInfo(ASB.MECHANICAL_ERR, 'Mechanical error generated', Severity.ERROR, Category.MECHANISM, True),
+    StatusInfo(ASB.AUTOCUTTER_ERR, 'Auto cutter error generated', Severity.ERROR, Category.MECHANISM, True),
+    StatusInfo(ASB.UNRECOVER_ERR, 'Unrecoverable error generated', Severity.ERROR, Category.MECHANISM, False),
+    StatusInfo(ASB.AUTORECOVER_ERR, 'Auto recovery error generated', Severity.ERROR, Category.MECHANISM, True),
+    StatusInfo(ASB.WAIT_SLIP_INSERTION, 'Waiting for insertion of a slip sheet for slip printing',
+               Severity.INFO, Category.SLIP, True),
+    StatusInfo(ASB.RECEIPT_NEAR_END, 'Roll paper has almost run out', Severity.WARNING, Category.PAPER, True),
+    StatusInfo(ASB.WAIT_SLIP_EJECTION, 'Waiting for ejection of a slip sheet for slip printing',
+               Severity.INFO, Category.SLIP, True),
+    StatusInfo(ASB.RECEIPT_END, 'Roll paper has run out', Severity.ERROR, Category.PAPER, True),
+    StatusInfo(ASB.BUZZER, 'Buzzer is sounding OR Waiting for paper removal', Severity.INFO, Category.PRINTER, True),
+    StatusInfo(ASB.REMOVAL_DETECT_PAPER_NONE, 'No paper is detected with the paper removal detector',
+               Severity.INFO, Category.PAPER, True),
+    StatusInfo(ASB.SPOOLER_IS_STOPPED, 'Spooler stopped', Severity.ERROR, Category.SPOOLER, True),
+)
+
+
+@lru_cache(maxsize=1024)
+def decode(asb: int) -> tuple[StatusInfo, ...]:
+    """All status entries that are set in the ASB status value"""
+    return tuple(info for info in STATUS_TABLE if asb & info.flag)
+
+
+@lru_cache(maxsize=1024)
+def severity(asb: int) -> Severity:
+    """Highest severity of the status value, INFO when nothing is wrong"""
+    return max((info.severity for info in decode(asb)), key=lambda s: s.value, default=Severity.INFO)
+
+
 def parse_code(asb: int) -> [str]:
-    msg = []
-
-    if asb & 0x00000001:
-        msg.append('No printer response')
-    if asb & 0x00000002:
-        msg.append('Printing is succssfully completed')
-    if asb & 0x00000004:
-        msg.append('Status of the drawer kick number 3 connector pin = "H"')
-    if asb & 0x00000008:
-        msg.append('Offline status')
-    if asb & 0x00000020:
-        msg.append('Cover is open')
-    if asb & 0x00000040:
-        msg.append('Paper feed switch is feeding paper')
-    if asb & 0x00000100:
-        msg.append('Waiting for online recovery')
-    if asb & 0x00000200:
-        msg.append('Panel switch is ON')
-    if asb & 0x00000400:
-        msg.append('Mechanical error generated')
-    if asb & 0x00000800:
-        msg.append('Auto cutter error generated')
-    if asb & 0x00002000:
-        msg.append('Unrecoverable error generated')
-    if asb & 0x00004000:
-        msg.append('Auto recovery error generated')
-    if asb & 0x00010000:
-        msg.append('Waiting for insertion of a slip sheet for slip printing')
-    if asb & 0x00020000:
-        msg.append('Roll paper has almost run out')
-    if asb & 0x00040000:
-        msg.append('Waiting for ejection of a slip sheet for slip printing')
-    if asb & 0x00080000:
-        msg.append('Roll paper has run out')
-    if asb & 0x01000000:
-        msg.append('Buzzer is sounding OR Waiting for paper removal')
-    if asb & 0x80000000:
-        msg.append('No paper is detected with the paper removal detector ')
-    if asb & 0x80000000:
-        msg.append('Spooler stopped')
-
-    return msg
+    return [info.message for info in decode(asb)]
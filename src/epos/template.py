@@ -0,0 +1,132 @@
+import re
+from typing import Iterable
+
+from .document import EposDocument, Fragment, _to_str
+from .elements import BaseElement, Cut, Page, _escape_cdata
+
+_SLOT_START = '\ue000'
+_SLOT_END = '\ue001'  # Private use characters, never escaped by the serializer
+_SLOT = re.compile(f'{_SLOT_START}([^{_SLOT_END}]*){_SLOT_END}')
+
+
+def _marker(name: str) -> str:
+    if not name.isidentifier():
+        raise ValueError(f'Placeholder name must be a valid identifier, got {name!r}')
+    return f'{_SLOT_START}{name}{_SLOT_END}'
+
+
+class Placeholder(str):
+    """
+    Variable text in a Template.
+
+    Use it as (part of) the text of an element:
+    Text(Placeholder('total')) or Text('Total: ' + Placeholder('total') + '\\n')
+    """
+    def __new__(cls, name: str):
+        placeholder = super().__new__(cls, _marker(name))
+        placeholder.name = name
+        return placeholder
+
+    def __getnewargs__(self):
+        # Copies and pickles are rebuilt from the name, not from the marker text
+        return (self.name,)
+
+
+class ElementSlot:
+    """
+    Variable list of elements in a Template, e.g. the item lines of a receipt.
+    Add it to the body of the document like any other element.
+    """
+    def __init__(self, name: str):
+        self._marker = _marker(name)
+        self.name = name
+
+    def __repr__(self):
+        return f'SLOT: {self.name}'
+
+    def freeze(self) -> 'ElementSlot':
+        """Slots never change, so they can be part of a Fragment or a frozen document"""
+        return self
+
+    def _write_xml(self, out: list[str]) -> None:
+        out.append(self._marker)
+
+    def _is_cached(self) -> bool:
+        return True
+
+    def _lock(self) -> 'ElementSlot':
+        return self
+
+
+class Template:
+    """
+    Document with placeholders that is serialized once.
+
+    Rendering only escapes the values and joins them with the precomputed XML,
+    the elements of the document are not touched anymore.
+
+    tpl = Template(doc)
+    printer.print_xml(tpl.render(total='12.50', items=[Text('Fries\\n')]))
+    """
+    def __init__(self, doc: EposDocument, autocut: bool = True):
+        body = list(doc.body)
+        if autocut:
+            body.append(Cut())
+
+        parts = _SLOT.split(_to_str('epos-print', body))
+        self._parts = parts
+        self._text_slots = []
+        self._element_slots = []
+
+        element_names = {slot.name for slot in _find_slots(body)}
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            if name in element_names:
+                self._element_slots.append((index, name))
+            else:
+                self._text_slots.append((index, name))
+
+        self.names = frozenset(parts[1::2])
+
+    def __repr__(self):
+        return f'TEMPLATE: {sorted(self.names)}'
+
+    def render(self, **values) -> str:
+        """
+        Fill in the placeholders.
+
+        Text placeholders accept any value, it is converted with str() and XML escaped.
+        Element slots accept an iterable of elements, a Fragment or an EposDocument.
+
+        :return: Serialized epos-print body
+        """
+        missing = self.names.difference(values)
+        if missing:
+            raise KeyError(f'No value for placeholder(s): {", ".join(sorted(missing))}')
+
+        parts = self._parts.copy()
+        for index, name in self._text_slots:
+            parts[index] = _escape_cdata(str(values[name]))
+        for index, name in self._element_slots:
+            parts[index] = _elements_to_str(values[name])
+        return ''.join(parts)
+
+
+def _find_slots(elements: Iterable) -> Iterable[ElementSlot]:
+    for element in elements:
+        if isinstance(element, ElementSlot):
+            yield element
+        elif isinstance(element, (Fragment, Page)):
+            yield from _find_slots(element.elements)
+
+
+def _elements_to_str(elements: Iterable[BaseElement] | Fragment | EposDocument) -> str:
+    if isinstance(elements, EposDocument):
+        elements = elements.body
+    elif isinstance(elements, (BaseElement, Fragment)):
+        elements = [elements]
+
+    out = []
+    for element in elements:
+        element._write_xml(out)
+    return ''.join(out)
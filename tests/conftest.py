@@ -0,0 +1,9 @@
+import pytest
+
+from epos.emulator import Emulator
+
+
+@pytest.fixture
+def emulator():
+    with Emulator() as emulator:
+        yield emulator
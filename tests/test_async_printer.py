@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from epos.async_printer import AsyncPrinter  # noqa: E402
+from epos.document import EposDocument  # noqa: E402
+from epos.elements import Text  # noqa: E402
+
+
+def _doc(text: str) -> EposDocument:
+    doc = EposDocument()
+    doc.add_body(Text(text))
+    return doc
+
+
+def test_print(emulator):
+    doc = _doc('a')
+    body = doc.body_to_str()
+
+    async def main():
+        async with AsyncPrinter(emulator.address) as printer:
+            return await printer.print(doc), await printer.printer_ready()
+
+    response, ready = asyncio.run(main())
+
+    assert response.success
+    assert ready
+    assert [job.tags for job in emulator.jobs] == [['text', 'cut'], []]
+    assert doc.body_to_str() == body
+
+
+def test_failure_code(emulator):
+    emulator.cover_open = True
+
+    async def main():
+        async with AsyncPrinter(emulator.address) as printer:
+            return await printer.print(_doc('a'))
+
+    response = asyncio.run(main())
+
+    assert not response.success
+    assert response.code == 'EPTR_COVER_OPEN'
+
+
+def test_max_concurrency_limits_requests_in_flight(emulator):
+    emulator.latency = 0.05
+
+    async def main():
+        async with AsyncPrinter(emulator.address, max_concurrency=2) as printer:
+            return await asyncio.gather(*(printer.print(_doc(str(i))) for i in range(6)))
+
+    responses = asyncio.run(main())
+
+    assert all(response.success for response in responses)
+    assert emulator.max_in_flight == 2
+
+
+def test_batch_and_stream_match_printer(emulator):
+    large = EposDocument(body=[Text(f'b{i} ' * 40) for i in range(9)])
+
+    async def main():
+        async with AsyncPrinter(emulator.address, max_payload=700) as printer:
+            batch = await printer.print_batch([_doc('a'), large, _doc('c')])
+            stream = await printer.print_stream((Text(f'line {i}\n') for i in range(10)), max_elements=4)
+            return batch, stream
+
+    batch, stream = asyncio.run(main())
+
+    assert [response.success for response in batch] == [True, True, True]
+    assert stream.success
+    assert all(len(job.data.encode('utf-8')) <= 700 for job in emulator.jobs)
+    assert emulator.jobs[-1].tags[-1] == 'cut'
@@ -0,0 +1,77 @@
+import copy
+import pickle
+
+import pytest
+
+from epos.document import EposDocument, Fragment
+from epos.elements import Text
+
+
+def _doc() -> EposDocument:
+    doc = EposDocument()
+    doc.add_body(Text('a'))
+    doc.add_page([Text('b')])
+    doc.add_body(Fragment([Text('c')]))
+    return doc
+
+
+def test_freeze_copies_the_elements():
+    doc = _doc()
+    frozen = doc.freeze()
+
+    doc.body[0].text = 'changed'
+
+    assert frozen.body_to_str() == _doc().body_to_str()
+    assert frozen == _doc().freeze()
+    assert hash(frozen) == hash(_doc().freeze())
+
+
+def test_frozen_elements_cannot_be_changed():
+    frozen = _doc().freeze()
+    text, page, fragment = frozen.body
+
+    with pytest.raises(AttributeError):
+        text.text = 'x'
+    with pytest.raises(AttributeError):
+        text.bold = True
+    with pytest.raises(AttributeError):
+        page.add(Text('x'))
+    with pytest.raises(AttributeError):
+        page.elements[0].text = 'x'
+    with pytest.raises(AttributeError):
+        fragment.elements[0].text = 'x'
+    with pytest.raises(AttributeError):
+        frozen.body = ()
+    assert frozen.body_to_str() == _doc().body_to_str()
+
+
+def test_thawed_and_copied_elements_can_be_changed():
+    frozen = _doc().freeze()
+
+    thawed = frozen.thaw()
+    thawed.body[0].text = 'x'
+    element = copy.copy(frozen.body[0])
+    element.text = 'y'
+
+    assert '<text>x</text>' in thawed.body_to_str()
+    assert element.to_xml_str() == '<text>y</text>'
+    assert frozen.body[0].text == 'a'
+
+
+def test_pickled_snapshot_stays_frozen():
+    frozen = _doc().freeze()
+
+    restored = pickle.loads(pickle.dumps(frozen))
+
+    assert restored == frozen
+    with pytest.raises(AttributeError):
+        restored.body[0].text = 'x'
+
+
+def test_extend_and_add_share_the_body():
+    header = EposDocument(body=[Text('a')]).freeze()
+
+    receipt = header.extend([Text('b')]) + EposDocument(body=[Text('c')]).freeze()
+
+    assert receipt.body_to_str() == EposDocument(body=[Text('a'), Text('b'), Text('c')]).body_to_str()
+    assert receipt.body[0] is header.body[0]
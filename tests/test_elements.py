@@ -0,0 +1,68 @@
+import pytest
+
+from epos.constants import Dir, Mode
+from epos.document import EposDocument
+from epos.elements import (
+    EPOS_PRINT_NS, Barcode, BatchBegin, BatchEnd, Cut, Feed, Image, Page, Position, RotateBegin, RotateEnd, Text,
+)
+from epos.printer import Printer
+
+
+@pytest.mark.parametrize('element', [Text('a'), Feed(line=1), Image(), Cut()], ids=lambda element: element.tag)
+def test_elements_have_no_instance_dict(element):
+    assert not hasattr(element, '__dict__')
+    with pytest.raises(AttributeError):
+        element.unknown = 1
+
+
+def test_attributes_in_order_without_defaults():
+    assert Image(width=8, height=1, text='AA==').to_xml_str() == '<image width="8" height="1">AA==</image>'
+    assert Image(width=8, height=1, mode=Mode.GRAY16).to_xml_str() == '<image width="8" height="1" mode="gray16"/>'
+    assert Text('a', bold=True, font='font_b').to_xml_str() == '<text font="font_b" em="true">a</text>'
+
+
+def test_attr_matches_serialized_attributes():
+    image = Image(width=8, height=1, mode=Mode.GRAY16)
+
+    assert image.attr == {'width': '8', 'height': '1', 'mode': 'gray16'}
+    assert Text('a').attr == {}
+
+
+def test_each_class_has_its_own_attribute_writer():
+    assert Text._write_attrs is not Image._write_attrs
+    assert Barcode._write_attrs is not Text._write_attrs
+
+
+def test_page_with_area_direction_and_position(emulator):
+    doc = EposDocument()
+    page = doc.add_page([Text('a')], area=(0, 0, 576, 200), direction=Dir.TOP_TO_BOTTOM)
+    page.add(Position(10, 20))
+    page.add(Text('b'))
+
+    with Printer(emulator.address) as printer:
+        assert printer.print(doc).success
+
+    assert doc.body_to_str() == (
+        f'<epos-print xmlns="{EPOS_PRINT_NS}"><page>'
+        '<area x="0" y="0" width="576" height="200"/><direction dir="top_to_bottom"/>'
+        '<text>a</text><position x="10" y="20"/><text>b</text>'
+        '</page></epos-print>'
+    )
+    assert emulator.jobs[0].tags == ['page', 'cut']
+
+
+def test_page_freezes_and_follows_changes():
+    page = Page([Text('a')]).freeze()
+    assert page.to_xml_str() == '<page><text>a</text></page>'
+
+    page.elements[0].text = 'b'
+    page.add(Feed(line=1))
+
+    assert page.to_xml_str() == '<page><text>b</text><feed line="1"/></page>'
+    assert Page().to_xml_str() == '<page/>'
+
+
+@pytest.mark.parametrize('cls', [BatchBegin, BatchEnd, RotateBegin, RotateEnd])
+def test_unimplemented_elements(cls):
+    with pytest.raises(NotImplementedError):
+        cls()
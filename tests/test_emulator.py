@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from epos.document import EposDocument
+from epos.elements import Text
+from epos.emulator import SchemaError, validate
+from epos.printer import Printer, _soap_payload
+from epos.status import ASB
+
+_EPOS_PRINT = '<epos-print xmlns="http://www.epson-pos.com/schemas/2011/03/epos-print">{}</epos-print>'
+
+
+def _request(body: str) -> str:
+    return _soap_payload(body).decode('utf-8')
+
+
+def _doc(text: str) -> EposDocument:
+    doc = EposDocument()
+    doc.add_body(Text(text))
+    return doc
+
+
+def test_validate_accepts_documents():
+    doc = _doc('a')
+    doc.add_page([Text('b')], area=(0, 0, 576, 100))
+
+    document = validate(_request(doc.body_to_str()))
+
+    assert [child.tag.rpartition('}')[2] for child in document] == ['text', 'page']
+
+
+@pytest.mark.parametrize('body, message', [
+    ('<epos-print', 'Invalid XML'),
+    (_EPOS_PRINT.format('<bogus/>'), 'Unexpected element bogus'),
+    (_EPOS_PRINT.format('<text size="1">a</text>'), 'Unknown attribute size'),
+    (_EPOS_PRINT.format('<text font="font_z">a</text>'), 'Invalid value'),
+    (_EPOS_PRINT.format('<area/>'), 'Unexpected element area'),
+    (_EPOS_PRINT.format('<text><feed/></text>'), 'cannot contain'),
+    ('<print/>', 'Expected epos-print'),
+])
+def test_validate_rejects_invalid_bodies(body, message):
+    with pytest.raises(SchemaError, match=message):
+        validate(_request(body))
+
+
+def test_invalid_job_fails_with_schema_error(emulator):
+    with Printer(emulator.address) as printer:
+        response = printer.print_xml(_EPOS_PRINT.format('<x/>'))
+
+    assert response.code == 'SchemaError'
+    assert emulator.jobs[0].document is None
+
+
+def test_status_and_unknown_device(emulator):
+    emulator.near_end = True
+
+    with Printer(emulator.address) as printer, Printer(emulator.address, devid='other') as other:
+        response = printer.print(_doc('a'))
+        unknown = other.print(_doc('a'))
+
+    assert ASB(response.status) == ASB.PRINT_SUCCESS | ASB.RECEIPT_NEAR_END
+    assert unknown.code == 'DeviceNotFound'
+
+
+def test_busy_printer_times_out(emulator):
+    emulator.busy = True
+
+    with Printer(emulator.address, job_timeout=50) as printer:
+        assert printer.print(_doc('a')).code == 'EX_TIMEOUT'
+
+    emulator.busy = False
+    with Printer(emulator.address, job_timeout=50) as printer:
+        assert printer.print(_doc('a')).success
+
+
+def test_jobs_are_printed_one_at_a_time(emulator):
+    emulator.latency = 0.05
+    printers = [Printer(emulator.address) for _ in range(3)]
+    threads = [threading.Thread(target=printer.print, args=(_doc('a'),)) for printer in printers]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(emulator.jobs) == 3
+    assert time.monotonic() - start >= 3 * emulator.latency
+
+
+def test_client_timeout_is_not_reported_by_the_server(emulator, capsys):
+    emulator.latency = 0.3
+
+    with Printer(emulator.address, request_timeout=0.1) as printer:
+        with pytest.raises(requests.ReadTimeout):
+            printer.print(_doc('a'))
+    emulator.latency = 0
+    with Printer(emulator.address) as printer:
+        printer.print_empty()
+    time.sleep(0.1)
+
+    assert capsys.readouterr().err == ''
@@ -0,0 +1,84 @@
+import socket
+
+from epos.document import EposDocument
+from epos.elements import Text
+from epos.emulator import Emulator
+from epos.fleet import PrinterFleet
+from epos.printer import Printer
+
+
+def _unreachable() -> str:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        host, port = s.getsockname()
+    return f'{host}:{port}'
+
+
+def _doc(text: str) -> EposDocument:
+    doc = EposDocument()
+    doc.add_body(Text(text))
+    return doc
+
+
+def test_poll_and_cached_status(emulator):
+    with PrinterFleet(status_ttl=60) as fleet:
+        fleet.add('bar', Printer(emulator.address))
+        fleet.add('down', Printer(_unreachable()))
+
+        assert fleet.last_status('bar') is None
+        statuses = fleet.poll()
+
+        assert statuses['bar'].success
+        assert statuses['down'].code == 'CONNECTION_ERROR'
+        assert fleet.last_status('bar') is statuses['bar']
+        assert fleet.status('bar') is statuses['bar']
+        assert len(emulator.jobs) == 1
+
+
+def test_print_many_keeps_job_order(emulator):
+    with Emulator() as other, PrinterFleet() as fleet:
+        fleet.add('a', Printer(emulator.address))
+        fleet.add('b', Printer(other.address))
+
+        responses = fleet.print_many([('a', _doc('1')), ('b', _doc('2')), ('a', _doc('3'))])
+
+        assert all(response.success for response in responses)
+        assert [job.document[0].text for job in emulator.jobs] == ['1', '3']
+        assert [job.document[0].text for job in other.jobs] == ['2']
+
+
+def test_print_to_first_ready_skips_failing_printers(emulator):
+    with Emulator(paper_out=True) as empty, PrinterFleet() as fleet:
+        fleet.add('down', Printer(_unreachable()), groups=['kitchen'])
+        fleet.add('empty', Printer(empty.address), groups=['kitchen'])
+        fleet.add('ok', Printer(emulator.address), groups=['kitchen'])
+
+        name, response = fleet.print_to_first_ready('kitchen', _doc('a'))
+
+        assert name == 'ok'
+        assert response.success
+        assert fleet.group('kitchen') == ['down', 'empty', 'ok']
+
+
+def test_print_to_first_ready_without_ready_printer(emulator):
+    emulator.paper_out = True
+    with PrinterFleet() as fleet:
+        fleet.add('empty', Printer(emulator.address), groups=['kitchen'])
+
+        name, response = fleet.print_to_first_ready('kitchen', _doc('a'))
+
+    assert name is None
+    assert response.code == 'NO_PRINTER_READY'
+    assert emulator.jobs[0].tags == []
+
+
+def test_remove(emulator):
+    with PrinterFleet() as fleet:
+        fleet.add('a', Printer(emulator.address), groups=['g'])
+        fleet.poll()
+
+        fleet.remove('a')
+
+        assert len(fleet) == 0
+        assert fleet.group('g') == []
+        assert fleet.last_status('a') is None
@@ -0,0 +1,127 @@
+import socket
+import threading
+
+import pytest
+import requests
+
+from epos.document import EposDocument
+from epos.elements import Text
+from epos.instrumentation import JobMetrics, MetricsRecorder, Phase
+from epos.printer import SOAP_OVERHEAD, Printer
+
+
+class _Collector:
+    def __init__(self):
+        self.metrics: list[JobMetrics] = []
+
+    def job_finished(self, metrics: JobMetrics) -> None:
+        self.metrics.append(metrics)
+
+
+def _doc(lines: int) -> EposDocument:
+    doc = EposDocument()
+    for i in range(lines):
+        doc.add_body(Text(f'{i} ' * 40))
+    return doc
+
+
+def test_print_reports_every_phase(emulator):
+    collector = _Collector()
+
+    with Printer(emulator.address, instrumentation=collector) as printer:
+        printer.print(_doc(1))
+        printer.print_xml(_doc(1).body_to_str())
+
+    printed, sent = collector.metrics
+    assert set(printed.timings) == {Phase.SERIALIZE, Phase.ENVELOPE, Phase.SEND, Phase.PARSE}
+    assert set(sent.timings) == {Phase.ENVELOPE, Phase.SEND, Phase.PARSE}
+    assert printed.success
+    assert printed.payload_bytes == printed.body_bytes + SOAP_OVERHEAD == len(emulator.jobs[0].data.encode('utf-8'))
+    assert printed.response_bytes > 0
+    assert printed.retries == 0
+
+
+def test_split_batch_and_stream_report_serialize(emulator):
+    collector = _Collector()
+
+    with Printer(emulator.address, instrumentation=collector, max_payload=700) as printer:
+        printer.print(_doc(5))
+        printer.print_batch([_doc(1), _doc(5)])
+        printer.print_stream(_doc(5).body, max_elements=2)
+
+    assert len(collector.metrics) == len(emulator.jobs) > 3
+    assert all(Phase.SERIALIZE in metrics.timings for metrics in collector.metrics)
+
+
+def test_failed_job_code(emulator):
+    emulator.paper_out = True
+    collector = _Collector()
+
+    with Printer(emulator.address, instrumentation=collector) as printer:
+        printer.print(_doc(1))
+
+    metrics, = collector.metrics
+    assert not metrics.success
+    assert metrics.code == 'EPTR_REC_EMPTY'
+
+
+def test_connect_failure_counts_connect_retries():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        host, port = s.getsockname()
+    collector = _Collector()
+
+    with Printer(f'{host}:{port}', instrumentation=collector, retries=2) as printer:
+        with pytest.raises(requests.ConnectionError):
+            printer.print(_doc(1))
+
+    metrics, = collector.metrics
+    assert metrics.code == 'CONNECTION_ERROR'
+    assert isinstance(metrics.error, requests.ConnectionError)
+    assert metrics.retries == 2
+
+
+def test_dropped_connection_counts_no_retries():
+    server = socket.create_server(('127.0.0.1', 0))
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                conn.recv(65536)
+
+    threading.Thread(target=serve, daemon=True).start()
+    host, port = server.getsockname()
+    collector = _Collector()
+    try:
+        with Printer(f'{host}:{port}', instrumentation=collector, retries=2) as printer:
+            with pytest.raises(requests.ConnectionError):
+                printer.print(_doc(1))
+    finally:
+        server.close()
+
+    assert collector.metrics[0].retries == 0
+
+
+def test_recorder_aggregates_per_printer(emulator):
+    recorder = MetricsRecorder()
+
+    with Printer(emulator.address, instrumentation=recorder) as printer:
+        printer.print(_doc(1))
+        emulator.paper_out = True
+        printer.print(_doc(1))
+
+    stats = recorder.stats[emulator.address]
+    assert stats.jobs == 2
+    assert stats.failures == 1
+    assert stats.errors == 0
+    assert stats.codes == {'': 1, 'EPTR_REC_EMPTY': 1}
+    assert stats.bytes_sent == sum(len(job.data.encode('utf-8')) for job in emulator.jobs)
+    assert stats.phase_max[Phase.SEND] <= stats.phase_totals[Phase.SEND]
+    assert stats.mean(Phase.SEND) == stats.phase_totals[Phase.SEND] / 2
+
+    recorder.reset()
+    assert recorder.stats == {}
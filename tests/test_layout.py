@@ -0,0 +1,104 @@
+import pytest
+
+from epos.constants import Align, Font
+from epos.elements import Feed, Text
+from epos.layout import Column, Layout, char_columns, merge_elements, text_columns
+
+
+def test_table_aligns_columns():
+    layout = Layout(paper_width=240, font=Font.A)
+
+    lines = layout.table([('Fries', '2.50'), ('Coke', '1.80')], [Column(), Column(6, Align.RIGHT)])
+
+    assert layout.columns == 20
+    assert lines == [
+        'Fries           2.50',
+        'Coke            1.80',
+    ]
+
+
+def test_table_wraps_and_truncates():
+    layout = Layout(paper_width=120)
+
+    lines = layout.table([('one two three', 'abcdefgh')], [Column(5), Column(4, wrap=False)])
+
+    assert lines == ['one   abcd', 'two', 'three']
+
+
+def test_table_counts_wide_characters():
+    layout = Layout(paper_width=120)
+
+    assert layout.table([('日本', 'x')], [Column(), Column(1)]) == ['日本     x']
+
+
+def test_text_element():
+    text = Layout(font=Font.B).text(['a  ', 'b'], bold=True)
+
+    assert text.text == 'a\nb\n'
+    assert text.font is Font.B
+    assert text.bold
+
+
+def test_merge_elements():
+    a, b, c = Text('a'), Text('b'), Text('c', bold=True)
+    feeds = [Feed(line=1), Feed(line=2), Feed(unit=10)]
+
+    merged = merge_elements([a, b, c, *feeds])
+
+    assert [type(element) for element in merged] == [Text, Text, Feed, Feed]
+    assert merged[0].text == 'ab'
+    assert merged[1] is c
+    assert merged[2].line == 3
+    assert merged[3] is feeds[2]
+    # The elements themselves are not changed
+    assert a.text == 'a'
+    assert feeds[0].line == 1
+
+
+def test_char_columns():
+    assert text_columns('abc') == 3
+    assert text_columns('日本') == 4
+    assert text_columns('é') == 1
+    assert char_columns('\u200b') == 0
+
+
+def test_columns_depend_on_font_and_width():
+    assert Layout().columns == 48
+    assert Layout(font=Font.B).columns == 64
+    assert Layout(width=2).columns == 24
+    assert Layout(double_width=True).columns == 24
+
+
+def test_wrap():
+    layout = Layout(paper_width=120)
+
+    assert layout.wrap('the quick brown fox') == ['the quick', 'brown fox']
+    assert layout.wrap('abcdefghijklmn') == ['abcdefghij', 'klmn']
+    assert layout.wrap('a\n\nb') == ['a', '', 'b']
+    assert layout.wrap('日本語日本語', 5) == ['日本', '語日', '本語']
+
+
+def test_align_and_truncate():
+    layout = Layout(paper_width=120)
+
+    assert layout.align('ab', Align.RIGHT, 5) == '   ab'
+    assert layout.align('ab', Align.CENTER, 5) == ' ab  '
+    assert layout.align('abcdef', Align.LEFT, 4) == 'abcd'
+    assert layout.truncate('日本語', 5) == '日本'
+
+
+def test_columns_that_do_not_fit():
+    layout = Layout(paper_width=120)
+
+    with pytest.raises(ValueError):
+        layout.column_widths([Column(6), Column(6)])
+    with pytest.raises(ValueError):
+        layout.row(['a'], [Column(), Column()])
+
+
+def test_merge_keeps_feeds_with_other_attributes_and_limit():
+    feeds = [Feed(line=200), Feed(line=100), Feed(line=1, linespc=30)]
+
+    merged = merge_elements(feeds)
+
+    assert [feed.line for feed in merged] == [200, 100, 1]
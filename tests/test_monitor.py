@@ -0,0 +1,82 @@
+import socket
+import threading
+
+from epos.elements import Response
+from epos.monitor import EventKind, StatusMonitor, _PrinterState
+from epos.printer import Printer
+from epos.status import ASB
+
+
+def _unreachable() -> str:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        host, port = s.getsockname()
+    return f'{host}:{port}'
+
+
+def _changes(events) -> list[tuple[EventKind, ASB | None]]:
+    return [(event.kind, event.flag) for event in events]
+
+
+def test_poll_reports_changed_flags(emulator):
+    monitor = StatusMonitor({'bar': Printer(emulator.address)})
+
+    assert monitor.poll('bar') == []
+    emulator.near_end = True
+    assert _changes(monitor.poll('bar')) == [(EventKind.FLAG_SET, ASB.RECEIPT_NEAR_END)]
+    assert monitor.poll('bar') == []
+
+    emulator.near_end = False
+    emulator.cover_open = True
+    events = monitor.poll('bar')
+
+    assert _changes(events) == [
+        (EventKind.FLAG_SET, ASB.OFF_LINE),
+        (EventKind.FLAG_SET, ASB.COVER_OPEN),
+        (EventKind.FLAG_CLEARED, ASB.RECEIPT_NEAR_END),
+    ]
+    assert events[1].info.message == 'Cover is open'
+
+
+def test_unreachable_printer_backs_off():
+    monitor = StatusMonitor({'down': Printer(_unreachable())}, interval=1, max_interval=5)
+    intervals = []
+
+    events = monitor.poll('down')
+    for _ in range(4):
+        intervals.append(monitor._states['down'].interval)
+        assert monitor.poll('down') == []
+
+    assert _changes(events) == [(EventKind.OFFLINE, None)]
+    assert intervals == [1, 2, 4, 5]
+
+
+def test_unreadable_reply_keeps_the_last_status():
+    monitor = StatusMonitor({})
+    state = _PrinterState()
+
+    monitor._update('bar', state, Response(True, '', int(ASB.COVER_OPEN | ASB.OFF_LINE)))
+    events = monitor._update('bar', state, Response(False, 'PARSING_ERROR', 0))
+    assert _changes(events) == [(EventKind.OFFLINE, None)]
+    assert state.status == ASB.COVER_OPEN | ASB.OFF_LINE
+
+    events = monitor._update('bar', state, Response(True, '', int(ASB.COVER_OPEN | ASB.OFF_LINE)))
+    assert _changes(events) == [(EventKind.ONLINE, None)]
+    assert state.interval == monitor.interval
+
+
+def test_background_polling_delivers_events(emulator):
+    received = []
+    changed = threading.Event()
+
+    def callback(event):
+        received.append(event)
+        changed.set()
+
+    with StatusMonitor({'bar': Printer(emulator.address)}, interval=0.05) as monitor:
+        monitor.subscribe(callback)
+        emulator.paper_out = True
+        assert changed.wait(timeout=5)
+
+    assert (EventKind.FLAG_SET, ASB.RECEIPT_END) in _changes(received)
+    assert all(event.printer == 'bar' for event in received)
@@ -0,0 +1,261 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from epos.document import EposDocument, Fragment
+from epos.elements import Text
+from epos.printer import SOAP_OVERHEAD, Printer
+
+
+def _doc(*texts: str) -> EposDocument:
+    doc = EposDocument()
+    for text in texts:
+        doc.add_body(Text(text))
+    return doc
+
+
+def _texts(job) -> list[str]:
+    return [child.text for child in job.document if child.tag.endswith('}text')]
+
+
+def test_print_adds_cut_without_changing_the_document(emulator):
+    doc = _doc('a')
+    body = doc.body_to_str()
+
+    with Printer(emulator.address) as printer:
+        assert printer.print(doc).success
+        assert printer.print(doc, autocut=False).success
+
+    assert [job.tags for job in emulator.jobs] == [['text', 'cut'], ['text']]
+    assert doc.body_to_str() == body
+    assert len(doc.body) == 1
+
+
+def test_requests_reuse_one_connection(emulator):
+    with Printer(emulator.address) as printer:
+        for _ in range(3):
+            assert printer.print_empty().success
+        pools = printer._session.get_adapter('http://').poolmanager.pools
+        pool, = (pools[key] for key in pools.keys())
+
+    assert pool.num_requests == 3
+    assert pool.num_connections == 1
+
+
+def test_print_failure_code(emulator):
+    emulator.paper_out = True
+
+    with Printer(emulator.address) as printer:
+        response = printer.print(_doc('a'))
+
+    assert not response.success
+    assert response.code == 'EPTR_REC_EMPTY'
+
+
+def test_print_batch_joins_documents(emulator):
+    with Printer(emulator.address) as printer:
+        responses = printer.print_batch([_doc('a'), _doc('b'), _doc('c')])
+
+    assert len(responses) == 3
+    assert all(response.success for response in responses)
+    assert len(emulator.jobs) == 1
+    assert emulator.jobs[0].tags == ['text', 'cut'] * 3
+
+
+def test_print_batch_splits_documents_over_max_payload(emulator):
+    large = _doc(*(f'b{i} ' * 40 for i in range(9)))
+
+    with Printer(emulator.address, max_payload=700) as printer:
+        responses = printer.print_batch([_doc('a'), large, _doc('c')])
+
+    assert [response.success for response in responses] == [True, True, True]
+    jobs = emulator.jobs
+    assert len(jobs) > 3
+    assert all(len(job.data.encode('utf-8')) <= 700 for job in jobs)
+    texts = [text for job in jobs for text in _texts(job)]
+    assert texts == ['a'] + [f'b{i} ' * 40 for i in range(9)] + ['c']
+    # Only the last part of the split document is cut
+    assert [job.tags.count('cut') for job in jobs] == [1] + [0] * (len(jobs) - 3) + [1, 1]
+
+
+def test_print_batch_skips_rest_of_split_document_after_failure(emulator):
+    large = _doc(*(f'b{i} ' * 40 for i in range(9)))
+
+    with Printer(emulator.address, max_payload=700) as printer:
+        send = printer.print_xml
+
+        def print_xml(data):
+            # The first part of the large document fails
+            emulator.paper_out = len(emulator.jobs) == 1
+            return send(data)
+
+        printer.print_xml = print_xml
+        responses = printer.print_batch([_doc('a'), large, _doc('c')])
+
+    assert [response.code for response in responses] == ['', 'EPTR_REC_EMPTY', '']
+    assert [_texts(job)[0] for job in emulator.jobs] == ['a', 'b0 ' * 40, 'c']
+
+
+def test_print_stream_sends_elements_in_jobs(emulator):
+    elements = (Text(f'line {i}\n') for i in range(10))
+
+    with Printer(emulator.address) as printer:
+        response = printer.print_stream(elements, max_elements=4)
+
+    assert response.success
+    jobs = emulator.jobs
+    assert [len(_texts(job)) for job in jobs] == [4, 4, 2]
+    assert [text for job in jobs for text in _texts(job)] == [f'line {i}\n' for i in range(10)]
+    assert [job.tags[-1] for job in jobs] == ['text', 'text', 'cut']
+
+
+def test_print_stream_stops_at_failure(emulator):
+    emulator.paper_out = True
+
+    with Printer(emulator.address) as printer:
+        response = printer.print_stream((Text(f'line {i}\n') for i in range(10)), max_elements=4)
+
+    assert response.code == 'EPTR_REC_EMPTY'
+    assert len(emulator.jobs) == 1
+
+
+def test_payload_size_matches_request(emulator):
+    doc = _doc('héllo')
+
+    with Printer(emulator.address) as printer:
+        size = printer.payload_size(doc)
+        printer.print(doc)
+
+    assert size == len(emulator.jobs[0].data.encode('utf-8'))
+
+
+def test_print_batch_respects_max_bytes(emulator):
+    docs = [_doc(f'{i} ' * 50) for i in range(6)]
+    max_bytes = 3 * len(docs[0].body_to_str().encode('utf-8'))
+
+    with Printer(emulator.address) as printer:
+        responses = printer.print_batch(docs, max_bytes=max_bytes)
+
+    assert len(responses) == 6
+    assert len(emulator.jobs) == 2
+    assert all(len(job.data.encode('utf-8')) - SOAP_OVERHEAD <= max_bytes for job in emulator.jobs)
+    assert [text for job in emulator.jobs for text in _texts(job)] == [f'{i} ' * 50 for i in range(6)]
+
+
+def test_print_batch_sends_large_document_alone(emulator):
+    docs = [_doc('a'), _doc('b' * 500), _doc('c')]
+
+    with Printer(emulator.address) as printer:
+        responses = printer.print_batch(docs, autocut=False, max_bytes=200)
+
+    assert [job.tags for job in emulator.jobs] == [['text'], ['text'], ['text']]
+    assert responses[1] is not responses[0]
+
+
+def test_print_batch_failure_applies_to_documents_in_request(emulator):
+    emulator.paper_out = True
+
+    with Printer(emulator.address) as printer:
+        responses = printer.print_batch([_doc('a'), _doc('b')])
+
+    assert [response.code for response in responses] == ['EPTR_REC_EMPTY'] * 2
+    assert responses[0] is responses[1]
+
+
+def test_print_batch_of_no_documents(emulator):
+    with Printer(emulator.address) as printer:
+        assert printer.print_batch([]) == []
+
+    assert emulator.jobs == []
+
+
+def test_print_splits_over_max_payload(emulator):
+    doc = _doc(*(f'€{i} ' * 40 for i in range(9)))
+
+    with Printer(emulator.address, max_payload=700) as printer:
+        assert printer.payload_size(doc) > 700
+        response = printer.print(doc)
+
+    assert response.success
+    jobs = emulator.jobs
+    assert len(jobs) > 1
+    assert all(len(job.data.encode('utf-8')) <= 700 for job in jobs)
+    assert [text for job in jobs for text in _texts(job)] == [f'€{i} ' * 40 for i in range(9)]
+    assert [job.tags.count('cut') for job in jobs] == [0] * (len(jobs) - 1) + [1]
+
+
+def test_split_print_stops_at_failure(emulator):
+    doc = _doc(*(f'{i} ' * 40 for i in range(9)))
+    emulator.paper_out = True
+
+    with Printer(emulator.address, max_payload=700) as printer:
+        assert printer.print(doc).code == 'EPTR_REC_EMPTY'
+
+    assert len(emulator.jobs) == 1
+
+
+def test_element_larger_than_max_payload(emulator):
+    with Printer(emulator.address, max_payload=300) as printer:
+        with pytest.raises(ValueError, match='does not fit'):
+            printer.print(_doc('a' * 400))
+
+    assert emulator.jobs == []
+
+
+def test_payload_is_utf8(emulator):
+    with Printer(emulator.address) as printer:
+        printer.print(_doc('Grüße 日本'))
+
+    assert _texts(emulator.jobs[0]) == ['Grüße 日本']
+
+
+def test_shared_document_printed_from_threads(emulator):
+    doc = _doc('a').freeze()
+    body = doc.body_to_str()
+
+    with Printer(emulator.address, pool_size=4) as printer, ThreadPoolExecutor(4) as pool:
+        responses = list(pool.map(printer.print, [doc] * 8))
+
+    assert all(response.success for response in responses)
+    assert all(job.tags == ['text', 'cut'] for job in emulator.jobs)
+    assert doc.body_to_str() == body
+
+
+def test_print_empty_sends_no_cut(emulator):
+    with Printer(emulator.address) as printer:
+        assert printer.printer_ready()
+
+    assert emulator.jobs[0].tags == []
+
+
+def test_print_stream_respects_max_bytes(emulator):
+    lines = [f'{i} ' * 30 + '\n' for i in range(20)]
+
+    with Printer(emulator.address) as printer:
+        assert printer.print_stream(map(Text, lines), max_bytes=500).success
+
+    jobs = emulator.jobs
+    assert len(jobs) > 2
+    assert all(len(job.data.encode('utf-8')) - SOAP_OVERHEAD <= 500 for job in jobs)
+    assert [text for job in jobs for text in _texts(job)] == lines
+
+
+def test_print_stream_sends_large_element_alone(emulator):
+    with Printer(emulator.address) as printer:
+        printer.print_stream([Text('a'), Text('b' * 300), Text('c')], autocut=False, max_bytes=200)
+
+    assert [_texts(job) for job in emulator.jobs] == [['a'], ['b' * 300], ['c']]
+
+
+def test_print_stream_expands_fragments(emulator):
+    with Printer(emulator.address) as printer:
+        printer.print_stream([Fragment([Text('a'), Text('b')]), Text('c')], max_elements=2)
+
+    assert [_texts(job) for job in emulator.jobs] == [['a', 'b'], ['c']]
+
+
+def test_print_stream_without_elements_cuts(emulator):
+    with Printer(emulator.address) as printer:
+        assert printer.print_stream(iter(())).success
+
+    assert [job.tags for job in emulator.jobs] == [['cut']]
@@ -0,0 +1,189 @@
+import base64
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from epos.constants import Mode  # noqa: E402
+from epos.document import EposDocument  # noqa: E402
+from epos.printer import Printer  # noqa: E402
+from epos.raster import Dither, RasterCache, cache_key, to_image, to_raster  # noqa: E402
+
+
+def test_mono_raster_packs_dots():
+    image = np.array([[0, 255, 0, 255, 0, 255, 0, 255, 0]], dtype=np.uint8)
+
+    raster, width, height = to_raster(image, dither=Dither.NONE)
+
+    assert (width, height) == (9, 1)
+    assert raster == bytes([0b10101010, 0b10000000])
+
+
+def test_gray16_raster_packs_two_dots_per_byte():
+    image = np.array([[0, 255, 0]], dtype=np.uint8)
+
+    raster, width, height = to_raster(image, mode=Mode.GRAY16, dither=Dither.NONE)
+
+    assert raster == bytes([0xf0, 0xf0])
+
+
+def test_image_is_printed(emulator):
+    image = np.zeros((8, 16), dtype=bool)
+    doc = EposDocument()
+    doc.add_body(to_image(image))
+
+    with Printer(emulator.address) as printer:
+        assert printer.print(doc).success
+
+    element = emulator.jobs[0].document[0]
+    assert element.attrib['width'] == '16'
+    assert element.attrib['height'] == '8'
+    assert base64.b64decode(element.text) == bytes(16)
+
+
+def test_cache_returns_same_payload():
+    cache = RasterCache()
+    image = np.full((4, 8), 255, dtype=np.uint8)
+
+    first = to_image(image, cache=cache)
+    second = to_image(image.copy(), cache=cache)
+
+    assert second.text == first.text
+    assert len(cache) == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_cache_key_depends_on_options():
+    image = np.zeros((4, 8), dtype=np.uint8)
+
+    keys = {
+        cache_key(image, Mode.MONO, Dither.NONE, 128),
+        cache_key(image, Mode.MONO, Dither.NONE, 100),
+        cache_key(image, Mode.GRAY16, Dither.NONE, 128),
+        cache_key(image, Mode.MONO, Dither.BAYER, 128),
+        cache_key(image.astype(np.float32), Mode.MONO, Dither.NONE, 128),
+    }
+
+    assert len(keys) == 5
+
+
+def test_cache_key_depends_on_palette():
+    Image = pytest.importorskip('PIL.Image')
+    black = Image.new('P', (8, 1))
+    black.putpalette([0, 0, 0] * 256)
+    white = Image.new('P', (8, 1))
+    white.putpalette([255, 255, 255] * 256)
+    cache = RasterCache()
+
+    assert cache_key(black, Mode.MONO, Dither.NONE, 128) != cache_key(white, Mode.MONO, Dither.NONE, 128)
+    assert to_image(black, dither=Dither.NONE, cache=cache).text == '/w=='
+    assert to_image(white, dither=Dither.NONE, cache=cache).text == 'AA=='
+
+
+def _reference_floyd_steinberg(gray, threshold):
+    # Plain row by row error diffusion
+    height, width = gray.shape
+    buf = gray.astype(np.float64).copy()
+    out = np.empty_like(buf)
+    for y in range(height):
+        for x in range(width):
+            old = buf[y, x]
+            new = 0.0 if old < threshold else 255.0
+            out[y, x] = new
+            error = old - new
+            if x + 1 < width:
+                buf[y, x + 1] += error * 7 / 16
+            if y + 1 < height:
+                if x > 0:
+                    buf[y + 1, x - 1] += error * 3 / 16
+                buf[y + 1, x] += error * 5 / 16
+                if x + 1 < width:
+                    buf[y + 1, x + 1] += error * 1 / 16
+    return out
+
+
+def test_floyd_steinberg_matches_row_by_row_diffusion():
+    gray = np.random.default_rng(1).integers(0, 256, (13, 21), dtype=np.uint8)
+
+    raster, width, height = to_raster(gray)
+
+    expected = np.packbits(_reference_floyd_steinberg(gray, 128) == 0, axis=1).tobytes()
+    assert raster == expected
+
+
+@pytest.mark.parametrize('dither', list(Dither))
+def test_gray_levels_are_kept_on_average(dither):
+    image = np.full((32, 32), 128, dtype=np.uint8)
+
+    raster, _, _ = to_raster(image, dither=dither)
+
+    dots = np.unpackbits(np.frombuffer(raster, dtype=np.uint8)).mean()
+    assert (0.4 < dots < 0.6) if dither is not Dither.NONE else dots == 0
+
+
+def test_supported_image_types():
+    black = np.zeros((2, 8), dtype=np.uint8)
+    expected = to_raster(black, dither=Dither.NONE)
+
+    assert to_raster(np.ones((2, 8), dtype=bool), dither=Dither.NONE) == expected
+    assert to_raster(np.zeros((2, 8), dtype=np.float64), dither=Dither.NONE) == expected
+    assert to_raster(np.zeros((2, 8, 3), dtype=np.uint8), dither=Dither.NONE) == expected
+    # Transparent black is printed as white paper
+    assert to_raster(np.zeros((2, 8, 4), dtype=np.uint8), dither=Dither.NONE)[0] == bytes(2)
+
+
+def test_pil_image():
+    Image = pytest.importorskip('PIL.Image')
+    image = Image.new('1', (10, 2), 0)
+
+    assert to_raster(image, dither=Dither.NONE) == (b'\xff\xc0' * 2, 10, 2)
+
+
+@pytest.mark.parametrize('image', [np.zeros((2, 577)), np.zeros((2, 2, 2)), np.zeros(4)])
+def test_invalid_images(image):
+    with pytest.raises(ValueError):
+        to_raster(image)
+
+
+def test_image_element_attributes():
+    element = to_image(np.zeros((3, 4), dtype=np.uint8), mode=Mode.GRAY16, align='center')
+
+    assert element.to_xml_str() == '<image width="4" height="3" align="center" mode="gray16">////////</image>'
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RasterCache(max_bytes=10)
+    cache.put('a', ('aaaa', 1, 1))
+    cache.put('b', ('bbbb', 1, 1))
+    assert cache.get('a') is not None
+
+    cache.put('c', ('cccc', 1, 1))
+
+    assert cache.get('b') is None
+    assert cache.get('a') == ('aaaa', 1, 1)
+    assert cache.size == 8
+    cache.put('large', ('x' * 11, 1, 1))
+    assert len(cache) == 2
+
+
+def test_cache_directory_survives_restart(tmp_path):
+    image = np.zeros((2, 8), dtype=np.uint8)
+    first = to_image(image, cache=RasterCache(directory=tmp_path))
+
+    cache = RasterCache(directory=tmp_path)
+    second = to_image(image, cache=cache)
+
+    assert second.text == first.text
+    assert (cache.disk_hits, cache.misses) == (1, 0)
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_clear_keeps_files(tmp_path):
+    cache = RasterCache(directory=tmp_path)
+    cache.put('a', ('aaaa', 1, 1))
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.hit_rate == 0.0
+    assert cache.get('a') == ('aaaa', 1, 1)
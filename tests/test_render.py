@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from epos.document import EposDocument
+from epos.elements import Text
+from epos.printer import Printer, _document_body
+from epos.render import render_many
+
+
+def make_voucher(code: str) -> EposDocument:
+    doc = EposDocument()
+    doc.add_body(Text(f'Voucher {code}\n'))
+    return doc
+
+
+def test_bodies_in_order_on_a_process_pool():
+    codes = [str(i) for i in range(40)]
+
+    bodies = list(render_many((partial(make_voucher, code) for code in codes), max_workers=2, chunksize=3))
+
+    assert bodies == [_document_body(make_voucher(code), True) for code in codes]
+
+
+def test_documents_and_frozen_documents():
+    docs = [make_voucher('a'), make_voucher('b').freeze()]
+
+    bodies = list(render_many(docs, autocut=False, max_workers=1))
+
+    assert bodies == [doc.body_to_str() for doc in docs]
+
+
+def test_existing_executor_is_not_shut_down(emulator):
+    with ThreadPoolExecutor(2) as executor, Printer(emulator.address) as printer:
+        for body in render_many(map(make_voucher, 'xyz'), executor=executor):
+            assert printer.print_xml(body).success
+        assert executor.submit(int, '1').result() == 1
+
+    assert [job.document[0].text for job in emulator.jobs] == ['Voucher x\n', 'Voucher y\n', 'Voucher z\n']
+
+
+def test_empty_input():
+    assert list(render_many([], max_workers=1)) == []
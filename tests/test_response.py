@@ -0,0 +1,66 @@
+import pytest
+
+from epos.printer import _parse_response
+
+_ENVELOPE = '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">{}</s:Envelope>'
+_RESPONSE = (
+    '<response success="{}" code="{}" status="{}" battery="{}" '
+    'xmlns="http://www.epson-pos.com/schemas/2011/03/epos-print"/>'
+)
+
+
+def test_success():
+    data = '<?xml version="1.0" encoding="utf-8"?>' + _ENVELOPE.format(
+        '<s:Body>' + _RESPONSE.format('true', '', 251658262, 0) + '</s:Body>'
+    )
+
+    response = _parse_response(data)
+
+    assert response.success
+    assert response.code == ''
+    assert response.status == 251658262
+    assert response.battery == 0
+
+
+def test_failure_after_header():
+    data = _ENVELOPE.format(
+        '<s:Header><parameter/></s:Header><s:Body>' + _RESPONSE.format('false', 'EPTR_COVER_OPEN', 8, 3) + '</s:Body>'
+    )
+
+    response = _parse_response(data)
+
+    assert not response.success
+    assert response.code == 'EPTR_COVER_OPEN'
+    assert (response.status, response.battery) == (8, 3)
+
+
+def test_stops_at_response():
+    # Anything after the response element is not read
+    data = _ENVELOPE.format('<s:Body>' + _RESPONSE.format('true', '', 2, 0) + '</s:Body>')[:-20] + '<broken'
+
+    assert _parse_response(data).success
+
+
+@pytest.mark.parametrize('data, code', [
+    ('', 'PARSING_ERROR'),
+    ('<html>Not found', 'PARSING_ERROR'),
+    (_ENVELOPE.format(''), 'NO_BODY_FOUND'),
+    (_ENVELOPE.format('<s:Header/>'), 'NO_BODY_FOUND'),
+    (_ENVELOPE.format('<s:Body/>'), 'NO_BODY_FOUND'),
+    (_ENVELOPE.format('<s:Body><s:Fault/></s:Body>'), 'NO_RESPONSE_FOUND'),
+    ('<s:Body xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">' + _RESPONSE.format('true', '', 2, 0) + '</s:Body>',
+     'NO_BODY_FOUND'),
+])
+def test_unreadable_reply(data, code):
+    response = _parse_response(data)
+
+    assert not response.success
+    assert response.code == code
+    assert response.status == 0
+
+
+def test_response_is_slotted():
+    response = _parse_response('')
+
+    with pytest.raises(AttributeError):
+        response.unknown = 1
@@ -0,0 +1,73 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from epos.constants import HRI, Align, BarcodeType, Color, CutType, Font, Lang
+from epos.document import EposDocument, Fragment
+from epos.elements import Barcode, Cut, Feed, Image, Logo, Text
+
+
+def _tree_str(doc: EposDocument) -> str:
+    # The ElementTree serialization that body_to_str() used before
+    return ET.tostring(doc.body_to_xml(), encoding='unicode').replace(' />', '/>')
+
+
+def _elements() -> list:
+    return [
+        Text('Plain\n'),
+        Text('<Special> & "quotes" \'too\'\n', lang=Lang.DE, font=Font.B, width=2, height=3, bold=True,
+             align=Align.CENTER, color=Color.COLOR_1),
+        Text('Ünïcödé €\n', double_width=True, double_height=False, reverse=True, underline=True),
+        Text(''),
+        Feed(line=2),
+        Feed(unit=30, linespc=40),
+        Image(width=8, height=1, text='AA==', align=Align.RIGHT),
+        Logo(key1=32, key2=33),
+        Barcode(BarcodeType.CODE39, '1234', hri=HRI.BELOW, font=Font.A, width=2, height=64),
+        Cut(CutType.FEED),
+    ]
+
+
+@pytest.mark.parametrize('element', _elements(), ids=lambda element: element.tag)
+def test_element_matches_element_tree(element):
+    doc = EposDocument(body=[element])
+
+    assert doc.body_to_str() == _tree_str(doc)
+
+
+def test_document_matches_element_tree():
+    doc = EposDocument(body=_elements())
+    doc.add_page([Text('in page')], area=(0, 0, 576, 100), direction=None)
+
+    assert doc.body_to_str() == _tree_str(doc)
+    assert doc.body_to_str(url_encode_newlines=True) == _tree_str(doc).replace('\n', '&#10;')
+
+
+def test_empty_document_matches_element_tree():
+    assert EposDocument().body_to_str() == _tree_str(EposDocument())
+
+
+def test_frozen_element_cache_is_cleared_by_setters():
+    text = Text('a', bold=True).freeze()
+    assert text.to_xml_str() == '<text em="true">a</text>'
+
+    text.text = 'b'
+    text.bold = False
+
+    assert text.to_xml_str() == '<text em="false">b</text>'
+
+
+def test_fragment_is_serialized_once_and_follows_changes():
+    text = Text('a')
+    fragment = Fragment([text, Feed(line=1)])
+    doc = EposDocument(body=[fragment, Text('b')])
+
+    first = doc.body_to_str()
+    assert first == EposDocument(body=[Text('a'), Feed(line=1), Text('b')]).body_to_str()
+    assert fragment._is_cached()
+
+    fragment.elements[0].text = 'c'
+
+    assert not fragment._is_cached()
+    assert doc.body_to_str() == first.replace('<text>a</text>', '<text>c</text>')
+    assert doc.body_to_str() == _tree_str(doc)
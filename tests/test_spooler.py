@@ -0,0 +1,144 @@
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+from epos.document import EposDocument
+from epos.elements import Text
+from epos.printer import Printer
+from epos.spooler import Spooler, SpoolerClosed
+
+
+def _doc(text: str) -> EposDocument:
+    doc = EposDocument()
+    doc.add_body(Text(text))
+    return doc
+
+
+def test_jobs_are_printed_in_order(emulator):
+    emulator.latency = 0.01
+
+    with Spooler(Printer(emulator.address)) as spooler:
+        futures = [spooler.submit(_doc(str(i))) for i in range(5)]
+        responses = [future.result(timeout=5) for future in futures]
+
+    assert all(response.success for response in responses)
+    assert [job.document[0].text for job in emulator.jobs] == ['0', '1', '2', '3', '4']
+    assert emulator.max_in_flight == 1
+
+
+def test_transient_failure_is_retried(emulator):
+    emulator.busy = True
+
+    with Spooler(Printer(emulator.address, job_timeout=50), retries=2, retry_delay=0) as spooler:
+        response = spooler.submit(_doc('a')).result(timeout=5)
+
+    assert response.code == 'EX_TIMEOUT'
+    assert len(emulator.jobs) == 3
+
+
+def test_read_timeout_is_not_resent(emulator):
+    emulator.latency = 0.5
+
+    with Spooler(Printer(emulator.address, request_timeout=0.2), retries=2, retry_delay=0) as spooler:
+        future = spooler.submit(_doc('a'))
+        with pytest.raises(requests.ReadTimeout):
+            future.result(timeout=5)
+
+    time.sleep(0.5)
+    assert len(emulator.jobs) == 1
+
+
+def test_connection_error_is_retried_then_raised():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        host, port = s.getsockname()
+    attempts = []
+
+    printer = Printer(f'{host}:{port}')
+    send = printer.print_xml
+
+    def print_xml(data):
+        attempts.append(data)
+        return send(data)
+
+    printer.print_xml = print_xml
+    with Spooler(printer, retries=2, retry_delay=0) as spooler:
+        with pytest.raises(requests.ConnectionError):
+            spooler.submit(_doc('a')).result(timeout=5)
+
+    assert len(attempts) == 3
+
+
+def test_dropped_connection_is_not_resent():
+    # A printer that reads the whole job and closes the connection without a reply
+    server = socket.create_server(('127.0.0.1', 0))
+    received = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                received.append(conn.recv(65536))
+
+    threading.Thread(target=serve, daemon=True).start()
+    host, port = server.getsockname()
+    try:
+        with Spooler(Printer(f'{host}:{port}'), retries=3, retry_delay=0) as spooler:
+            with pytest.raises(requests.ConnectionError):
+                spooler.submit(_doc('a')).result(timeout=5)
+    finally:
+        server.close()
+
+    assert len(received) == 1
+
+
+def test_only_failed_part_of_split_document_is_resent(emulator):
+    doc = EposDocument()
+    for i in range(9):
+        doc.add_body(Text(f'{i} ' * 40))
+    printer = Printer(emulator.address, job_timeout=50, max_payload=700)
+    send = printer.print_xml
+
+    def print_xml(data):
+        # The printer is busy for the first two tries of the second part
+        emulator.busy = len(emulator.jobs) in (1, 2)
+        return send(data)
+
+    printer.print_xml = print_xml
+    with Spooler(printer, retries=2, retry_delay=0) as spooler:
+        assert spooler.submit(doc).result(timeout=5).success
+
+    jobs = emulator.jobs
+    assert [job.response.code for job in jobs[:4]] == ['', 'EX_TIMEOUT', 'EX_TIMEOUT', '']
+    assert jobs[1].data == jobs[3].data
+    texts = [child.text for job in jobs if job.response.success for child in job.document if child.text]
+    assert texts == [f'{i} ' * 40 for i in range(9)]
+
+
+def test_every_accepted_job_resolves_when_closed_concurrently(emulator):
+    spooler = Spooler(Printer(emulator.address), maxsize=0)
+    futures = []
+    rejected = []
+
+    def submit():
+        for i in range(50):
+            try:
+                futures.append(spooler.submit(_doc(str(i))))
+            except SpoolerClosed:
+                rejected.append(i)
+
+    threads = [threading.Thread(target=submit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    spooler.close()
+    for thread in threads:
+        thread.join()
+
+    assert all(future.result(timeout=5).success for future in futures)
+    assert len(futures) + len(rejected) == 200
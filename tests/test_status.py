@@ -0,0 +1,35 @@
+from epos.status import ASB, STATUS_TABLE, Category, Severity, decode, parse_code, severity
+
+
+def test_decode_in_table_order():
+    status = ASB.OFF_LINE | ASB.RECEIPT_END | ASB.PRINT_SUCCESS
+
+    infos = decode(int(status))
+
+    assert [info.flag for info in infos] == [ASB.PRINT_SUCCESS, ASB.OFF_LINE, ASB.RECEIPT_END]
+    assert infos[2].category is Category.PAPER
+    assert parse_code(int(status)) == [info.message for info in infos]
+
+
+def test_decode_nothing_set():
+    assert decode(0) == ()
+    assert parse_code(0) == []
+
+
+def test_every_flag_is_in_the_table():
+    assert {info.flag for info in STATUS_TABLE} == set(ASB)
+    assert decode(0xffffffff) == STATUS_TABLE
+
+
+def test_severity_is_the_highest():
+    assert severity(0) is Severity.INFO
+    assert severity(int(ASB.PRINT_SUCCESS)) is Severity.INFO
+    assert severity(int(ASB.PRINT_SUCCESS | ASB.RECEIPT_NEAR_END)) is Severity.WARNING
+    assert severity(int(ASB.RECEIPT_NEAR_END | ASB.COVER_OPEN | ASB.PANEL_SWITCH)) is Severity.ERROR
+
+
+def test_unrecoverable_error():
+    info, = decode(int(ASB.UNRECOVER_ERR))
+
+    assert not info.recoverable
+    assert info.severity is Severity.ERROR
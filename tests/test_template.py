@@ -0,0 +1,90 @@
+import copy
+import pickle
+
+import pytest
+
+from epos.document import EposDocument, Fragment
+from epos.elements import Cut, Text
+from epos.printer import Printer
+from epos.template import ElementSlot, Placeholder, Template
+
+
+def test_render_text_placeholder_is_escaped():
+    doc = EposDocument()
+    doc.add_body(Text('Total: ' + Placeholder('total') + '\n'))
+
+    tpl = Template(doc, autocut=False)
+
+    assert tpl.names == {'total'}
+    assert tpl.render(total='<1 & 2>') == EposDocument(body=[Text('Total: <1 & 2>\n')]).body_to_str()
+
+
+def test_render_element_slot_inside_page():
+    doc = EposDocument()
+    doc.add_page([Text('a'), ElementSlot('items')], area=(0, 0, 576, 200))
+
+    xml = Template(doc, autocut=False).render(items=[Text('b')])
+
+    assert '<text>a</text><text>b</text></page>' in xml
+    assert 'TEXT' not in xml
+
+
+def test_render_element_slot_inside_fragment_and_frozen_document(emulator):
+    doc = EposDocument()
+    doc.add_body(Fragment([Text('Items:\n'), ElementSlot('items')]))
+    doc.add_body(Text('Total: ' + Placeholder('total') + '\n'))
+
+    tpl = Template(doc.freeze())
+    xml = tpl.render(items=[Text('Fries\n'), Text('Coke\n')], total='4.30')
+
+    with Printer(emulator.address) as printer:
+        assert printer.print_xml(xml).success
+
+    job = emulator.jobs[0]
+    assert job.tags == ['text', 'text', 'text', 'text', 'cut']
+    assert [child.text for child in job.document][:4] == ['Items:\n', 'Fries\n', 'Coke\n', 'Total: 4.30\n']
+
+
+def test_render_missing_value():
+    tpl = Template(EposDocument(body=[Text(Placeholder('name'))]))
+
+    with pytest.raises(KeyError):
+        tpl.render()
+
+
+def test_slot_values_and_repeated_renders():
+    doc = EposDocument()
+    doc.add_body(Text('Hello ' + Placeholder('name') + '\n'))
+    doc.add_body(ElementSlot('items'))
+    tpl = Template(doc, autocut=False)
+    footer = EposDocument(body=[Text('z')])
+
+    first = tpl.render(name='Ann', items=Fragment([Text('x')]))
+    second = tpl.render(name='Bob', items=footer)
+    single = tpl.render(name='Cy', items=Text('y'))
+
+    assert tpl.names == {'name', 'items'}
+    assert first == EposDocument(body=[Text('Hello Ann\n'), Text('x')]).body_to_str()
+    assert second == EposDocument(body=[Text('Hello Bob\n'), Text('z')]).body_to_str()
+    assert single.endswith('<text>y</text></epos-print>')
+
+
+def test_template_copies_the_document():
+    doc = EposDocument(body=[Text(Placeholder('a'))])
+    tpl = Template(doc)
+
+    doc.body[0].text = 'changed'
+
+    assert tpl.render(a='1') == EposDocument(body=[Text('1'), Cut()]).body_to_str()
+
+
+def test_placeholder_copies_and_pickles():
+    placeholder = Placeholder('total')
+
+    assert copy.deepcopy(placeholder) == placeholder
+    assert pickle.loads(pickle.dumps(placeholder)).name == 'total'
+
+
+def test_placeholder_name_must_be_an_identifier():
+    with pytest.raises(ValueError):
+        Placeholder('not valid')